@@ -6,10 +6,46 @@ import os
 import json
 import time
 import threading
+import functools
+import contextlib
 from typing import Optional, List, Dict, Any
 
 DB_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "idm.db")
 
+# Connection tuning: WAL + NORMAL sync gives 2-5x write throughput on the hot
+# update path while keeping the DB corruption-safe; busy_timeout stops the
+# downloader threads racing into SQLITE_BUSY.
+_CONN_PRAGMAS = """
+    PRAGMA journal_mode=WAL;
+    PRAGMA synchronous=NORMAL;
+    PRAGMA busy_timeout=5000;
+    PRAGMA temp_store=MEMORY;
+    PRAGMA cache_size=-8000;
+    PRAGMA journal_size_limit=67108864;
+"""
+
+# Hot-path SQL kept as module constants so sqlite3 sees the same interned
+# string on every call (newer CPythons no longer cache parsed statements).
+SQL_ADD_DOWNLOAD = """
+    INSERT OR REPLACE INTO downloads
+    (id, url, filename, filepath, size, downloaded, status, category,
+     connections, speed_limit, priority, added_at, referer, extra_headers)
+    VALUES (:id, :url, :filename, :filepath, :size, :downloaded, :status,
+            :category, :connections, :speed_limit, :priority, :added_at,
+            :referer, :extra_headers)
+"""
+SQL_GET_DOWNLOAD = "SELECT * FROM downloads WHERE id = ?"
+SQL_SET_STATUS = "UPDATE downloads SET status = ? WHERE id = ?"
+SQL_UPDATE_PROGRESS = "UPDATE downloads SET downloaded = ?, size = ?, status = ? WHERE id = ?"
+
+
+@functools.lru_cache(maxsize=32)
+def _update_sql(fields: tuple) -> str:
+    """UPDATE statement for a field-set; the downloader cycles through the
+    same 2-3 sets, so this caches instead of rebuilding per call."""
+    sets = ", ".join(f"{k} = ?" for k in fields)
+    return f"UPDATE downloads SET {sets} WHERE id = ?"
+
 
 class Database:
     _local = threading.local()
@@ -17,21 +53,39 @@ class Database:
     def __init__(self, db_path: str = DB_PATH):
         self.db_path = db_path
         self._init_db()
+        # Settings are read on UI hot paths — serve them from memory and
+        # write-through on change. Lock guards the extension-server thread.
+        self._settings_lock = threading.Lock()
+        self._settings_cache: Dict[str, str] = {
+            r[0]: r[1] for r in
+            self.conn.execute("SELECT key, value FROM settings").fetchall()
+        }
+        # Categories change only through the settings dialog; cache the parsed
+        # list (same object between writes, so downstream per-list memos hold)
+        self._categories_cache: Optional[List[Dict]] = None
 
     def _get_conn(self) -> sqlite3.Connection:
         if not hasattr(self._local, 'conn') or self._local.conn is None:
             self._local.conn = sqlite3.connect(self.db_path, check_same_thread=False)
             self._local.conn.row_factory = sqlite3.Row
-            self._local.conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn.executescript(_CONN_PRAGMAS)
         return self._local.conn
 
     @property
     def conn(self):
         return self._get_conn()
 
+    def _cached_cursor(self, name: str) -> sqlite3.Cursor:
+        """Reusable per-thread cursor so hot statements skip re-parse."""
+        cur = getattr(self._local, name, None)
+        if cur is None:
+            cur = self._get_conn().cursor()
+            setattr(self._local, name, cur)
+        return cur
+
     def _init_db(self):
         conn = sqlite3.connect(self.db_path)
-        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(_CONN_PRAGMAS)
         conn.executescript("""
             CREATE TABLE IF NOT EXISTS downloads (
                 id          TEXT PRIMARY KEY,
@@ -63,6 +117,11 @@ class Database:
                 extensions  TEXT NOT NULL,
                 save_path   TEXT NOT NULL
             );
+
+            CREATE INDEX IF NOT EXISTS idx_downloads_active
+                ON downloads(status, priority DESC, added_at ASC);
+            CREATE INDEX IF NOT EXISTS idx_downloads_added
+                ON downloads(added_at DESC);
         """)
         # Insert default settings
         _dl_base = os.path.join(os.path.expanduser('~'), 'Downloads', 'WITTGrp')
@@ -77,8 +136,9 @@ class Database:
             'show_add_dialog': 'true',
             'theme': 'dark',
         }
-        for k, v in defaults.items():
-            conn.execute("INSERT OR IGNORE INTO settings VALUES (?, ?)", (k, v))
+        # Seed defaults in one transaction — one fsync instead of one per row
+        conn.execute("BEGIN")
+        conn.executemany("INSERT OR IGNORE INTO settings VALUES (?, ?)", defaults.items())
 
         # Default categories — each file type gets its own sub-folder
         cats = [
@@ -95,8 +155,7 @@ class Database:
             ('Other',     json.dumps([]),
                           os.path.join(_dl_base, 'Other')),
         ]
-        for cat in cats:
-            conn.execute("INSERT OR IGNORE INTO categories VALUES (?, ?, ?)", cat)
+        conn.executemany("INSERT OR IGNORE INTO categories VALUES (?, ?, ?)", cats)
 
         # Migration: update any old hardcoded D:\idm\downloads paths to new ~/Downloads/WITTGrp paths
         for name, _, new_path in cats:
@@ -112,18 +171,27 @@ class Database:
         conn.commit()
         conn.close()
 
+    @contextlib.contextmanager
+    def transaction(self, immediate: bool = False):
+        """Group several writes into a single commit (one fsync).
+
+        ``immediate`` grabs the write lock up front for hot write batches.
+        """
+        conn = self.conn
+        conn.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
+        try:
+            yield conn
+        except Exception:
+            conn.rollback()
+            raise
+        else:
+            conn.commit()
+
     # ── Downloads CRUD ─────────────────────────────────────────────────────
 
     def add_download(self, task: Dict[str, Any]) -> bool:
         try:
-            self.conn.execute("""
-                INSERT OR REPLACE INTO downloads
-                (id, url, filename, filepath, size, downloaded, status, category,
-                 connections, speed_limit, priority, added_at, referer, extra_headers)
-                VALUES (:id, :url, :filename, :filepath, :size, :downloaded, :status,
-                        :category, :connections, :speed_limit, :priority, :added_at,
-                        :referer, :extra_headers)
-            """, {
+            self.conn.execute(SQL_ADD_DOWNLOAD, {
                 'id': task['id'],
                 'url': task['url'],
                 'filename': task['filename'],
@@ -144,58 +212,126 @@ class Database:
         except Exception as e:
             return False
 
+    def add_downloads(self, tasks: List[Dict[str, Any]]) -> bool:
+        """Insert many downloads in one transaction — one fsync per batch."""
+        if not tasks:
+            return True
+        rows = [{
+            'id': t['id'],
+            'url': t['url'],
+            'filename': t['filename'],
+            'filepath': t['filepath'],
+            'size': t.get('size', 0),
+            'downloaded': t.get('downloaded', 0),
+            'status': t.get('status', 'Queued'),
+            'category': t.get('category', 'Other'),
+            'connections': t.get('connections', 8),
+            'speed_limit': t.get('speed_limit', 0),
+            'priority': t.get('priority', 1),
+            'added_at': t.get('added_at', time.time()),
+            'referer': t.get('referer', ''),
+            'extra_headers': json.dumps(t.get('extra_headers', {})),
+        } for t in tasks]
+        try:
+            with self.transaction() as conn:
+                conn.executemany(SQL_ADD_DOWNLOAD, rows)
+            return True
+        except Exception:
+            return False
+
     def update_download(self, task_id: str, fields: Dict[str, Any]):
         if not fields:
             return
-        sets = ", ".join(f"{k} = ?" for k in fields)
+        sql = _update_sql(tuple(fields))
         vals = list(fields.values()) + [task_id]
-        self.conn.execute(f"UPDATE downloads SET {sets} WHERE id = ?", vals)
+        # Reuse one cursor per SQL variant so sqlite's prepared-statement
+        # cache hits on every call
+        cursors = getattr(self._local, 'update_cursors', None)
+        if cursors is None:
+            cursors = self._local.update_cursors = {}
+        cur = cursors.get(sql)
+        if cur is None:
+            cur = cursors[sql] = self.conn.cursor()
+        cur.execute(sql, vals)
         self.conn.commit()
 
+    def set_status(self, task_id: str, status: str):
+        """Fixed-SQL fast path for the common single-field status update."""
+        self._cached_cursor('upd_status').execute(SQL_SET_STATUS, (status, task_id))
+        self.conn.commit()
+
+    def update_progress_bulk(self, rows: List[tuple]):
+        """Persist many (downloaded, size, status, id) rows in one transaction.
+
+        Used by the queue manager's 1 Hz flusher so progress ticks from all
+        download threads cost a single commit instead of one per task.
+        """
+        if not rows:
+            return
+        with self.transaction(immediate=True) as conn:
+            conn.executemany(SQL_UPDATE_PROGRESS, rows)
+
     def get_download(self, task_id: str) -> Optional[Dict]:
-        row = self.conn.execute("SELECT * FROM downloads WHERE id = ?", (task_id,)).fetchone()
+        row = self.conn.execute(SQL_GET_DOWNLOAD, (task_id,)).fetchone()
         return dict(row) if row else None
 
-    def get_all_downloads(self) -> List[Dict]:
-        rows = self.conn.execute("SELECT * FROM downloads ORDER BY added_at DESC").fetchall()
-        return [dict(r) for r in rows]
+    def get_all_downloads(self) -> List[sqlite3.Row]:
+        # sqlite3.Row already supports r['col'] access — skip the per-row
+        # dict copy; callers convert at their own boundary if they must
+        return self.conn.execute("SELECT * FROM downloads ORDER BY added_at DESC").fetchall()
 
     def delete_download(self, task_id: str):
         self.conn.execute("DELETE FROM downloads WHERE id = ?", (task_id,))
         self.conn.commit()
 
-    def get_active_downloads(self) -> List[Dict]:
-        rows = self.conn.execute(
+    def get_active_downloads(self) -> List[sqlite3.Row]:
+        return self.conn.execute(
             "SELECT * FROM downloads WHERE status IN ('Queued','Downloading','Paused') ORDER BY priority DESC, added_at ASC"
         ).fetchall()
-        return [dict(r) for r in rows]
 
     # ── Settings ───────────────────────────────────────────────────────────
 
     def get_setting(self, key: str, default: str = '') -> str:
-        row = self.conn.execute("SELECT value FROM settings WHERE key = ?", (key,)).fetchone()
-        return row[0] if row else default
+        with self._settings_lock:
+            return self._settings_cache.get(key, default)
 
     def set_setting(self, key: str, value: str):
+        with self._settings_lock:
+            self._settings_cache[key] = str(value)
         self.conn.execute("INSERT OR REPLACE INTO settings VALUES (?, ?)", (key, str(value)))
         self.conn.commit()
 
+    def set_settings_bulk(self, settings: Dict[str, str]):
+        """Write many settings in one transaction instead of one commit each."""
+        if not settings:
+            return
+        items = [(k, str(v)) for k, v in settings.items()]
+        with self._settings_lock:
+            self._settings_cache.update(items)
+        with self.transaction() as conn:
+            conn.executemany("INSERT OR REPLACE INTO settings VALUES (?, ?)", items)
+
+    def get_settings(self, keys: List[str]) -> Dict[str, str]:
+        """Fetch several settings in one call (served from the cache)."""
+        with self._settings_lock:
+            return {k: self._settings_cache[k]
+                    for k in keys if k in self._settings_cache}
+
     def get_all_settings(self) -> Dict[str, str]:
-        rows = self.conn.execute("SELECT key, value FROM settings").fetchall()
-        return {r[0]: r[1] for r in rows}
+        with self._settings_lock:
+            return dict(self._settings_cache)
 
     # ── Categories ─────────────────────────────────────────────────────────
 
     def get_categories(self) -> List[Dict]:
-        rows = self.conn.execute("SELECT * FROM categories").fetchall()
-        result = []
-        for r in rows:
-            result.append({
+        if self._categories_cache is None:
+            rows = self.conn.execute("SELECT * FROM categories").fetchall()
+            self._categories_cache = [{
                 'name': r['name'],
                 'extensions': json.loads(r['extensions']),
                 'save_path': r['save_path'],
-            })
-        return result
+            } for r in rows]
+        return self._categories_cache
 
     def update_category(self, name: str, extensions: list, save_path: str):
         self.conn.execute(
@@ -203,7 +339,20 @@ class Database:
             (name, json.dumps(extensions), save_path)
         )
         self.conn.commit()
+        self._categories_cache = None
 
     def clear_categories(self):
         self.conn.execute("DELETE FROM categories")
         self.conn.commit()
+        self._categories_cache = None
+
+    def replace_categories(self, categories: List[tuple]):
+        """Swap the whole categories table for (name, extensions, save_path)
+        tuples in one transaction — clear + N inserts, a single fsync."""
+        with self.transaction() as conn:
+            conn.execute("DELETE FROM categories")
+            conn.executemany(
+                "INSERT OR REPLACE INTO categories VALUES (?, ?, ?)",
+                [(n, json.dumps(e), p) for n, e, p in categories]
+            )
+        self._categories_cache = None
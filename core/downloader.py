@@ -4,15 +4,35 @@ Core Download Engine - Multi-threaded chunked downloader with resume support
 import os
 import json
 import time
+import asyncio
 import threading
+import collections
+import concurrent.futures
 import requests
 from typing import Optional, Callable, List
 from dataclasses import dataclass, field, asdict
 from enum import Enum
 import logging
+import traceback
+from logging.handlers import RotatingFileHandler
+
+try:
+    import orjson  # ~5-10x faster than stdlib json for the 3 s state saves
+except ImportError:
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
+# One buffered, rotating debug file instead of an open/write/close per error —
+# retry storms on a flaky network must not hammer the filesystem themselves
+try:
+    _debug_handler = RotatingFileHandler('idm_debug.txt', maxBytes=1 << 20,
+                                         backupCount=3, encoding='utf-8')
+    _debug_handler.setLevel(logging.ERROR)
+    logger.addHandler(_debug_handler)
+except OSError:
+    pass
+
 
 class DownloadStatus(Enum):
     QUEUED = "Queued"
@@ -43,77 +63,9 @@ class DownloadState:
     timestamp: float = field(default_factory=time.time)
 
 
-class ChunkDownloader(threading.Thread):
-    """Downloads a single byte-range chunk of a file."""
-
-    def __init__(self, url: str, chunk: ChunkInfo, temp_dir: str,
-                 headers: dict, proxy: Optional[str] = None,
-                 on_progress: Optional[Callable] = None,
-                 cancel_event: Optional[threading.Event] = None,
-                 pause_event: Optional[threading.Event] = None):
-        super().__init__(daemon=True)
-        self.url = url
-        self.chunk = chunk
-        self.temp_dir = temp_dir
-        self.headers = dict(headers)
-        self.proxy = proxy
-        self.on_progress = on_progress
-        self.cancel_event = cancel_event or threading.Event()
-        self.pause_event = pause_event or threading.Event()
-        self.error: Optional[Exception] = None
-        self.chunk_file = os.path.join(temp_dir, f"chunk_{chunk.index:04d}.tmp")
-
-    def run(self):
-        start = self.chunk.start + self.chunk.downloaded
-        end = self.chunk.end
-
-        if start > end:
-            self.chunk.completed = True
-            return
-
-        # Resume partial chunk from existing file
-        mode = 'ab' if self.chunk.downloaded > 0 else 'wb'
-        range_header = f"bytes={start}-{end}"
-        req_headers = {**self.headers, 'Range': range_header}
-
-        max_retries = 5
-        for attempt in range(max_retries):
-            try:
-                proxies = {'http': self.proxy, 'https': self.proxy} if self.proxy else None
-                with requests.get(self.url, headers=req_headers, stream=True,
-                                  timeout=30, proxies=proxies, verify=False) as resp:
-                    if resp.status_code not in (200, 206):
-                        raise Exception(f"HTTP {resp.status_code}")
-
-                    with open(self.chunk_file, mode) as f:
-                        for data in resp.iter_content(chunk_size=65536):
-                            if self.cancel_event.is_set():
-                                return
-                            # Handle pause
-                            while self.pause_event.is_set():
-                                if self.cancel_event.is_set():
-                                    return
-                                time.sleep(0.2)
-                            if data:
-                                f.write(data)
-                                n = len(data)
-                                self.chunk.downloaded += n
-                                if self.on_progress:
-                                    self.on_progress(n)
-
-                self.chunk.completed = True
-                return
-
-            except Exception as e:
-                self.error = e
-                logger.error(f"Chunk {self.chunk.index} attempt {attempt+1} failed: {e}")
-                import traceback
-                with open('idm_debug.txt', 'a') as df:
-                    df.write(f"Chunk {self.chunk.index} error: {e}\n")
-                    traceback.print_exc(file=df)
-                if attempt < max_retries - 1:
-                    time.sleep(2 ** attempt)  # exponential backoff
-                mode = 'ab'
+# Positioned writes: POSIX has pwrite; Windows doesn't, so chunk writers
+# there serialise a seek+write pair behind a lock instead.
+_HAS_PWRITE = hasattr(os, 'pwrite')
 
 
 class MultiThreadedDownloader:
@@ -151,11 +103,27 @@ class MultiThreadedDownloader:
         self._cancel_event = threading.Event()
         self._pause_event = threading.Event()
         self._lock = threading.RLock()
-        self._speed_samples: List[tuple] = []  # (timestamp, bytes)
+        # Serialises the seek+write fallback on platforms without os.pwrite
+        self._write_lock = threading.Lock()
+        self._speed_samples: collections.deque = collections.deque()  # (timestamp, bytes)
+        self._window_bytes = 0  # running sum of bytes in the sample window
+
+        # One pooled session shared by all chunk threads: persistent
+        # connections mean a single TLS handshake per host, not one per chunk
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=self.connections,
+            pool_maxsize=self.connections * 2,
+            max_retries=0,
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.verify = False
 
-        # Temp directory for this download
-        self.temp_dir = filepath + ".parts"
+        # Resume state lives next to the output file; chunks write directly
+        # into the preallocated output, so there is no temp directory.
         self.state_file = filepath + ".partinfo"
+        self._out_fd: Optional[int] = None
 
     def _state_path(self):
         return self.state_file
@@ -167,14 +135,18 @@ class MultiThreadedDownloader:
             total_size=self.total_size,
             chunks=chunks
         )
-        with open(self._state_path(), 'w') as f:
-            json.dump({
-                'url': state.url,
-                'filepath': state.filepath,
-                'total_size': state.total_size,
-                'chunks': [asdict(c) for c in state.chunks],
-                'completed': state.completed
-            }, f)
+        payload = {
+            'url': state.url,
+            'filepath': state.filepath,
+            'total_size': state.total_size,
+            'chunks': [asdict(c) for c in state.chunks],
+            'completed': state.completed
+        }
+        # Write to a temp file then rename so a crash never tears the state
+        tmp = self._state_path() + '.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(orjson.dumps(payload) if orjson else json.dumps(payload).encode())
+        os.replace(tmp, self._state_path())
 
     def _load_state(self) -> Optional[DownloadState]:
         if not os.path.exists(self._state_path()):
@@ -194,16 +166,26 @@ class MultiThreadedDownloader:
             return None
 
     def _get_file_info(self):
-        """Probe URL for file size and range support."""
-        headers = {**self.headers, 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) WITTGrp/1.0'}
+        """Probe URL for file size and range support.
+
+        A single `Range: bytes=0-0` GET answers both questions in one round
+        trip: a 206 confirms byte-range support and Content-Range carries the
+        total size. Also covers servers that 200 a HEAD but 206 a ranged GET.
+        """
+        headers = {**self.headers, 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) WITTGrp/1.0',
+                   'Range': 'bytes=0-0'}
         try:
-            resp = requests.head(self.url, headers=headers, timeout=15,
-                                 allow_redirects=True, verify=False)
-            # Follow redirect for real URL
-            self.url = resp.url
-            size = int(resp.headers.get('Content-Length', 0))
-            accepts_ranges = resp.headers.get('Accept-Ranges', '').lower() == 'bytes'
-            return size, accepts_ranges
+            with self.session.get(self.url, headers=headers, stream=True,
+                                  timeout=15, allow_redirects=True, verify=False) as resp:
+                # Follow redirect for real URL
+                self.url = resp.url
+                if resp.status_code == 206:
+                    # Content-Range: bytes 0-0/SIZE
+                    content_range = resp.headers.get('Content-Range', '')
+                    size = int(content_range.rpartition('/')[2]) if '/' in content_range else 0
+                    return size, True
+                size = int(resp.headers.get('Content-Length', 0))
+                return size, False
         except Exception:
             return 0, False
 
@@ -218,16 +200,17 @@ class MultiThreadedDownloader:
             # Update speeds and UI no more than 5 times per second
             if now - getattr(self, '_last_notify', 0.0) >= 0.2:
                 self._speed_samples.append((now, self._bytes_since_last_sample))
+                self._window_bytes += self._bytes_since_last_sample
                 self._bytes_since_last_sample = 0
-                
-                # Keep only last 3 seconds of samples
+
+                # Keep only last 3 seconds of samples — O(k) popleft, no rebuild
                 cutoff = now - 3.0
-                self._speed_samples = [(t, b) for t, b in self._speed_samples if t >= cutoff]
-                
-                total_bytes_in_window = sum(b for _, b in self._speed_samples)
+                while self._speed_samples and self._speed_samples[0][0] < cutoff:
+                    self._window_bytes -= self._speed_samples.popleft()[1]
+
                 time_window = now - self._speed_samples[0][0] if len(self._speed_samples) > 1 else 1.0
-                self.speed = total_bytes_in_window / max(time_window, 0.01)
-                
+                self.speed = self._window_bytes / max(time_window, 0.01)
+
                 self._last_notify = now
                 should_notify = True
             else:
@@ -246,12 +229,13 @@ class MultiThreadedDownloader:
 
     def start_download(self):
         """Start or resume the download in the current thread."""
-        os.makedirs(self.temp_dir, exist_ok=True)
+        os.makedirs(os.path.dirname(self.filepath) or '.', exist_ok=True)
         self._set_status(DownloadStatus.DOWNLOADING)
 
         # Check for existing state (resume)
         state = self._load_state()
-        if state and state.url == self.url and not state.completed:
+        fresh = not (state and state.url == self.url and not state.completed)
+        if not fresh:
             self.total_size = state.total_size
             chunks = state.chunks
             self.downloaded_bytes = sum(c.downloaded for c in chunks)
@@ -268,19 +252,51 @@ class MultiThreadedDownloader:
                 chunks = [ChunkInfo(index=0, start=0, end=max(size - 1, 0))]
             self._save_state(chunks)
 
-        # Download all incomplete chunks
-        success = self._run_chunks(chunks)
+        # Open (and on a fresh download preallocate) the final output file;
+        # every chunk pwrites at its own offset, so no merge pass is needed.
+        self._out_fd = os.open(
+            self.filepath,
+            os.O_WRONLY | os.O_CREAT | getattr(os, 'O_BINARY', 0), 0o644)
+        try:
+            if fresh and self.total_size > 0:
+                # posix_fallocate reserves contiguous extents in one syscall so
+                # concurrent chunk writes don't fragment; Windows lacks it, so
+                # fall back to a sparse truncate there.
+                if hasattr(os, 'posix_fallocate'):
+                    try:
+                        os.posix_fallocate(self._out_fd, 0, self.total_size)
+                    except OSError:
+                        os.ftruncate(self._out_fd, self.total_size)
+                else:
+                    os.ftruncate(self._out_fd, self.total_size)
+
+            success = self._run_chunks(chunks)
+        finally:
+            os.close(self._out_fd)
+            self._out_fd = None
 
         if success and not self._cancel_event.is_set():
-            self._set_status(DownloadStatus.MERGING)
-            self._merge_chunks(chunks)
-            self._cleanup(chunks)
+            self._cleanup()
             self._set_status(DownloadStatus.COMPLETED)
         elif self._cancel_event.is_set():
             self._set_status(DownloadStatus.STOPPED)
         else:
             self._set_status(DownloadStatus.ERROR)
 
+    def _write_at(self, data: bytes, offset: int):
+        """Write ``data`` into the shared output fd at an absolute offset.
+
+        Uses os.pwrite where it exists; Windows lacks it, so fall back to a
+        lock-guarded lseek+write pair — the same treatment posix_fallocate
+        gets above.
+        """
+        if _HAS_PWRITE:
+            os.pwrite(self._out_fd, data, offset)
+        else:
+            with self._write_lock:
+                os.lseek(self._out_fd, offset, os.SEEK_SET)
+                os.write(self._out_fd, data)
+
     def _split_into_chunks(self, size: int) -> List[ChunkInfo]:
         chunk_size = size // self.connections
         chunks = []
@@ -291,66 +307,174 @@ class MultiThreadedDownloader:
         return chunks
 
     def _run_chunks(self, chunks: List[ChunkInfo]) -> bool:
-        threads = []
-        for chunk in chunks:
-            if chunk.completed:
-                continue
-            t = ChunkDownloader(
-                url=self.url,
-                chunk=chunk,
-                temp_dir=self.temp_dir,
-                headers={**self.headers, 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) WITTGrp/1.0'},
-                proxy=self.proxy,
-                on_progress=self._chunk_progress,
-                cancel_event=self._cancel_event,
-                pause_event=self._pause_event,
-            )
-            threads.append(t)
-            t.start()
+        """Download all incomplete chunks.
+
+        Prefers the aiohttp event loop (one OS thread, C-level socket reads,
+        no per-chunk GIL thrash); falls back to thread-per-chunk when aiohttp
+        is not installed.
+        """
+        try:
+            import aiohttp  # noqa: F401
+        except ImportError:
+            return self._run_chunks_threaded(chunks)
+        return asyncio.run(self._run_chunks_aiohttp(chunks))
+
+    async def _run_chunks_aiohttp(self, chunks: List[ChunkInfo]) -> bool:
+        import aiohttp
 
-        if not threads:
+        pending = [c for c in chunks if not c.completed]
+        if not pending:
             return all(c.completed for c in chunks)
 
-        # Monitor and save state periodically
-        state_save_interval = 3.0
-        last_save = time.time()
-        while any(t.is_alive() for t in threads):
-            if self._cancel_event.is_set():
-                 break
-            time.sleep(0.5)
-            now = time.time()
-            if now - last_save > state_save_interval:
+        headers = {**self.headers, 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) WITTGrp/1.0'}
+        connector = aiohttp.TCPConnector(limit=self.connections, ssl=False)
+        timeout = aiohttp.ClientTimeout(total=None, sock_connect=30, sock_read=30)
+
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout,
+                                         headers=headers) as session:
+            tasks = [asyncio.ensure_future(self._fetch_chunk_async(session, c))
+                     for c in pending]
+            # Save state every few seconds while chunks are in flight
+            remaining = set(tasks)
+            while remaining:
+                done, remaining = await asyncio.wait(remaining, timeout=3.0)
                 self._save_state(chunks)
-                last_save = now
+                if self._cancel_event.is_set():
+                    for t in remaining:
+                        t.cancel()
+                    break
+            results = await asyncio.gather(*tasks, return_exceptions=True)
 
         self._save_state(chunks)
         return all(c.completed for c in chunks) and not any(
-            t.error for t in threads if not t.chunk.completed
+            isinstance(r, Exception) or r is False for r in results
         )
 
-    def _merge_chunks(self, chunks: List[ChunkInfo]):
-        """Merge all chunk temp files into the final file."""
-        os.makedirs(os.path.dirname(self.filepath) or '.', exist_ok=True)
-        with open(self.filepath, 'wb') as out:
-            for chunk in sorted(chunks, key=lambda c: c.index):
-                chunk_file = os.path.join(self.temp_dir, f"chunk_{chunk.index:04d}.tmp")
-                if os.path.exists(chunk_file):
-                    with open(chunk_file, 'rb') as f:
-                        while True:
-                            buf = f.read(1024 * 1024)
-                            if not buf:
-                                break
-                            out.write(buf)
-
-    def _cleanup(self, chunks: List[ChunkInfo]):
-        for chunk in chunks:
-            chunk_file = os.path.join(self.temp_dir, f"chunk_{chunk.index:04d}.tmp")
-            if os.path.exists(chunk_file):
-                os.remove(chunk_file)
-        try:
-            os.rmdir(self.temp_dir)
-        except Exception:
-            pass
+    async def _fetch_chunk_async(self, session, chunk: ChunkInfo) -> bool:
+        max_retries = 5
+        for attempt in range(max_retries):
+            start = chunk.start + chunk.downloaded
+            if start > chunk.end:
+                chunk.completed = True
+                return True
+            req_headers = {'Range': f"bytes={start}-{chunk.end}"}
+            try:
+                async with session.get(self.url, headers=req_headers,
+                                       proxy=self.proxy) as resp:
+                    if resp.status not in (200, 206):
+                        raise Exception(f"HTTP {resp.status}")
+                    async for data in resp.content.iter_chunked(65536):
+                        if self._cancel_event.is_set():
+                            return False
+                        while self._pause_event.is_set():
+                            if self._cancel_event.is_set():
+                                return False
+                            await asyncio.sleep(0.2)
+                        if data:
+                            self._write_at(data, chunk.start + chunk.downloaded)
+                            chunk.downloaded += len(data)
+                            self._chunk_progress(len(data))
+                chunk.completed = True
+                return True
+            except asyncio.CancelledError:
+                return False
+            except Exception as e:
+                logger.error(f"Chunk {chunk.index} attempt {attempt+1} failed: {e}")
+                if attempt < max_retries - 1:
+                    await asyncio.sleep(2 ** attempt)
+        return False
+
+    def _run_chunks_threaded(self, chunks: List[ChunkInfo]) -> bool:
+        pending = [c for c in chunks if not c.completed]
+        if not pending:
+            return all(c.completed for c in chunks)
+
+        with concurrent.futures.ThreadPoolExecutor(
+                max_workers=self.connections) as pool:
+            futures = [pool.submit(self._download_chunk, c) for c in pending]
+            # Wake on completion or every 3 s to persist state — no 500 ms poll
+            remaining = set(futures)
+            while remaining:
+                done, remaining = concurrent.futures.wait(remaining, timeout=3.0)
+                self._save_state(chunks)
+                if self._cancel_event.is_set():
+                    break
+
+        self._save_state(chunks)
+        return all(c.completed for c in chunks) and all(
+            f.result() for f in futures if f.done()
+        )
+
+    def _wait_while_paused(self) -> bool:
+        """Block while paused; returns False once cancelled.
+
+        Waiting on the cancel event instead of sleeping means cancellation
+        during a pause wakes the worker immediately.
+        """
+        while self._pause_event.is_set():
+            if self._cancel_event.wait(0.2):
+                return False
+        return not self._cancel_event.is_set()
+
+    def _download_chunk(self, chunk: ChunkInfo) -> bool:
+        """Download one byte-range chunk straight into the shared output file."""
+        headers = {**self.headers, 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) WITTGrp/1.0'}
+
+        max_retries = 5
+        for attempt in range(max_retries):
+            start = chunk.start + chunk.downloaded
+            if start > chunk.end:
+                chunk.completed = True
+                return True
+            req_headers = {**headers, 'Range': f"bytes={start}-{chunk.end}"}
+            try:
+                proxies = {'http': self.proxy, 'https': self.proxy} if self.proxy else None
+                with self.session.get(self.url, headers=req_headers, stream=True,
+                                      timeout=30, proxies=proxies, verify=False) as resp:
+                    if resp.status_code not in (200, 206):
+                        raise Exception(f"HTTP {resp.status_code}")
+
+                    # Collect 1 MiB network reads and flush ~4 MiB at a time:
+                    # one pwrite syscall and one progress callback per flush
+                    # instead of one per 64 KiB block
+                    bufs = []
+                    pending = 0
+                    for data in resp.iter_content(chunk_size=1 << 20):
+                        # Fast path: two C-level flag reads per block
+                        if self._pause_event.is_set() or self._cancel_event.is_set():
+                            if not self._wait_while_paused():
+                                return False
+                        if data:
+                            bufs.append(data)
+                            pending += len(data)
+                            if pending >= 4 << 20:
+                                # Write at the chunk's absolute offset — no
+                                # temp file, no merge pass afterwards
+                                self._write_at(
+                                    bufs[0] if len(bufs) == 1 else b''.join(bufs),
+                                    chunk.start + chunk.downloaded)
+                                chunk.downloaded += pending
+                                self._chunk_progress(pending)
+                                bufs.clear()
+                                pending = 0
+                    if pending:
+                        self._write_at(
+                            bufs[0] if len(bufs) == 1 else b''.join(bufs),
+                            chunk.start + chunk.downloaded)
+                        chunk.downloaded += pending
+                        self._chunk_progress(pending)
+
+                chunk.completed = True
+                return True
+
+            except Exception as e:
+                logger.error("Chunk %d attempt %d failed: %s\n%s",
+                             chunk.index, attempt + 1, e, traceback.format_exc())
+                if attempt < max_retries - 1:
+                    time.sleep(2 ** attempt)  # exponential backoff
+        return False
+
+    def _cleanup(self):
         if os.path.exists(self.state_file):
             os.remove(self.state_file)
 
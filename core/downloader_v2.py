@@ -4,13 +4,20 @@ Core Download Engine V2 - IDM-Style Dynamic Segmentation Downloader
 import os
 import json
 import time
+import shutil
 import threading
+import collections
 import requests
 from typing import Optional, Callable, List
 from dataclasses import dataclass, field, asdict
 from enum import Enum
 import logging
 
+try:
+    import orjson  # ~5-10x faster than stdlib json for the 2 s state saves
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
 class DownloadStatus(Enum):
@@ -118,7 +125,8 @@ class DynamicDownloader:
         self.error: Optional[Exception] = None
         
         # Speed measurement
-        self._speed_samples: List[tuple] = []
+        self._speed_samples: collections.deque = collections.deque()
+        self._window_bytes = 0
         self._bytes_since_last_sample = 0
         self._last_notify = 0.0
 
@@ -145,8 +153,11 @@ class DynamicDownloader:
                 'next_idx': self._next_chunk_idx
             }
         try:
-            with open(self._state_path(), 'w') as f:
-                json.dump(data, f)
+            # Write to a temp file then rename so a crash never tears the state
+            tmp = self._state_path() + '.tmp'
+            with open(tmp, 'wb') as f:
+                f.write(orjson.dumps(data) if orjson else json.dumps(data).encode())
+            os.replace(tmp, self._state_path())
         except Exception as e:
             logger.error(f"Failed to save state: {e}")
 
@@ -196,14 +207,15 @@ class DynamicDownloader:
 
             if now - self._last_notify >= 0.2:
                 self._speed_samples.append((now, self._bytes_since_last_sample))
+                self._window_bytes += self._bytes_since_last_sample
                 self._bytes_since_last_sample = 0
-                
+
                 cutoff = now - 3.0
-                self._speed_samples = [(t, b) for t, b in self._speed_samples if t >= cutoff]
-                
-                total_in_window = sum(b for _, b in self._speed_samples)
+                while self._speed_samples and self._speed_samples[0][0] < cutoff:
+                    self._window_bytes -= self._speed_samples.popleft()[1]
+
                 time_window = now - self._speed_samples[0][0] if len(self._speed_samples) > 1 else 1.0
-                self.speed = total_in_window / max(time_window, 0.01)
+                self.speed = self._window_bytes / max(time_window, 0.01)
                 self._last_notify = now
 
                 rem = max(self.total_size - self.downloaded_bytes, 0)
@@ -433,10 +445,9 @@ class DynamicDownloader:
                 cf = os.path.join(self.temp_dir, f"chunk_{chunk.index:04d}.tmp")
                 if os.path.exists(cf):
                     with open(cf, 'rb') as f:
-                        while True:
-                            buf = f.read(1024 * 1024)
-                            if not buf: break
-                            out.write(buf)
+                        # copyfileobj dispatches to sendfile/copy_file_range on
+                        # 3.11+, moving bytes in-kernel instead of via Python
+                        shutil.copyfileobj(f, out, length=1024 * 1024)
 
     def _cleanup(self):
         for chunk in self.chunks:
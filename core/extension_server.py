@@ -1,109 +1,170 @@
 """
 Extension Server - Receives download requests from browser extension
-Listens on localhost:9614 (HTTP)
+Listens on localhost:9614 (HTTP) on a single asyncio event loop
 """
 import json
+import asyncio
 import threading
 import logging
-from http.server import HTTPServer, BaseHTTPRequestHandler
 from typing import Callable, Optional
 
-logger = logging.getLogger(__name__)
-
-
-class ExtensionHandler(BaseHTTPRequestHandler):
-    queue_manager = None
-    add_dialog_callback: Optional[Callable] = None
+try:
+    import orjson  # parses the POST bytes directly, 3-5x faster than json
+except ImportError:
+    orjson = None
 
-    def do_OPTIONS(self):
-        self.send_response(200)
-        self._send_cors()
-        self.end_headers()
-
-    def do_POST(self):
-        content_length = int(self.headers.get('Content-Length', 0))
-        body = self.rfile.read(content_length)
-        self.send_response(200)
-        self._send_cors()
-        self.send_header('Content-Type', 'application/json')
-        self.end_headers()
-
-        try:
-            data = json.loads(body)
-            path = self.path.rstrip('/')
+logger = logging.getLogger(__name__)
 
-            if path == '/add':
-                self._handle_add(data)
-                self.wfile.write(json.dumps({'status': 'ok'}).encode())
-            elif path == '/ping':
-                self.wfile.write(json.dumps({'status': 'running', 'version': '1.0'}).encode())
-            else:
-                self.wfile.write(json.dumps({'status': 'unknown_path'}).encode())
-        except Exception as e:
-            logger.error(f"Extension server error: {e}")
-            self.wfile.write(json.dumps({'status': 'error', 'msg': str(e)}).encode())
+_CORS_HEADERS = (
+    "Access-Control-Allow-Origin: *\r\n"
+    "Access-Control-Allow-Methods: GET, POST, OPTIONS\r\n"
+    "Access-Control-Allow-Headers: Content-Type\r\n"
+)
 
-    def do_GET(self):
-        self.send_response(200)
-        self._send_cors()
-        self.send_header('Content-Type', 'application/json')
-        self.end_headers()
-        self.wfile.write(json.dumps({'status': 'running', 'version': '1.0'}).encode())
+# Constant responses prebuilt once — only error paths allocate
+_RESP_OK = b'{"status": "ok"}'
+_RESP_RUNNING = b'{"status": "running", "version": "1.0"}'
+_RESP_UNKNOWN = b'{"status": "unknown_path"}'
 
-    def _handle_add(self, data: dict):
-        url = data.get('url', '')
-        if not url:
-            return
-        referer = data.get('referer', '')
-        filename = data.get('filename', '')
-        extra_headers = data.get('headers', {})
 
-        if self.add_dialog_callback:
-            # Show add-download dialog in the UI thread
-            self.add_dialog_callback(url, filename, referer, extra_headers)
-        elif self.queue_manager:
-            self.queue_manager.add_download(
-                url=url,
-                filename=filename or None,
-                referer=referer,
-                extra_headers=extra_headers,
-                auto_start=True,
-            )
+def _loads(body: bytes):
+    return orjson.loads(body) if orjson else json.loads(body)
 
-    def _send_cors(self):
-        self.send_header('Access-Control-Allow-Origin', '*')
-        self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
-        self.send_header('Access-Control-Allow-Headers', 'Content-Type')
 
-    def log_message(self, format, *args):
-        pass  # Suppress default access log
+class ExtensionServer:
+    """Tiny asyncio HTTP server for the /add and /ping extension endpoints.
 
+    One event loop handles every request — no per-request thread, no stdlib
+    line-by-line header parsing overhead for the extension's hover pings.
+    """
 
-class ExtensionServer:
     def __init__(self, port: int = 9614,
                  queue_manager=None,
                  add_dialog_callback: Optional[Callable] = None):
         self.port = port
-        ExtensionHandler.queue_manager = queue_manager
-        ExtensionHandler.add_dialog_callback = add_dialog_callback
-        self._server: Optional[HTTPServer] = None
+        self.queue_manager = queue_manager
+        self.add_dialog_callback = add_dialog_callback
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
         self._thread: Optional[threading.Thread] = None
 
     def start(self):
+        self._thread = threading.Thread(target=self._run_loop, daemon=True)
+        self._thread.start()
+
+    def _run_loop(self):
         try:
-            self._server = HTTPServer(('127.0.0.1', self.port), ExtensionHandler)
-            self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
-            self._thread.start()
+            self._loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(self._loop)
+            server = self._loop.run_until_complete(
+                asyncio.start_server(self._handle_client, '127.0.0.1', self.port)
+            )
             logger.info(f"Extension server started on port {self.port}")
+            self._loop.run_forever()
+            server.close()
         except Exception as e:
             logger.error(f"Failed to start extension server: {e}")
 
     def stop(self):
-        if self._server:
-            self._server.shutdown()
+        if self._loop:
+            self._loop.call_soon_threadsafe(self._loop.stop)
 
     def update_callbacks(self, queue_manager=None, add_dialog_callback=None):
         if queue_manager:
-            ExtensionHandler.queue_manager = queue_manager
+            self.queue_manager = queue_manager
         if add_dialog_callback:
-            ExtensionHandler.add_dialog_callback = add_dialog_callback
+            self.add_dialog_callback = add_dialog_callback
+
+    # ── Request handling ───────────────────────────────────────────────────
+
+    async def _handle_client(self, reader: asyncio.StreamReader,
+                             writer: asyncio.StreamWriter):
+        try:
+            request_line = await reader.readline()
+            parts = request_line.decode('latin-1').split()
+            if len(parts) < 2:
+                return
+            method, path = parts[0], parts[1].rstrip('/')
+
+            # Headers — we only need Content-Length
+            content_length = 0
+            while True:
+                line = await reader.readline()
+                if line in (b'\r\n', b'\n', b''):
+                    break
+                if line.lower().startswith(b'content-length:'):
+                    content_length = int(line.split(b':', 1)[1])
+
+            body = await reader.readexactly(content_length) if content_length else b''
+
+            if method == 'OPTIONS':
+                self._write_response(writer, b'')
+            elif method == 'POST':
+                self._write_response(writer, self._dispatch_post(path, body))
+            else:
+                self._write_response(writer, _RESP_RUNNING)
+            await writer.drain()
+        except Exception as e:
+            logger.error(f"Extension server error: {e}")
+        finally:
+            writer.close()
+
+    def _dispatch_post(self, path: str, body: bytes) -> bytes:
+        try:
+            data = _loads(body)
+            if path == '/add':
+                self._handle_add(data)
+                return _RESP_OK
+            elif path == '/ping':
+                return _RESP_RUNNING
+            return _RESP_UNKNOWN
+        except Exception as e:
+            logger.error(f"Extension server error: {e}")
+            return json.dumps({'status': 'error', 'msg': str(e)}).encode()
+
+    def _write_response(self, writer: asyncio.StreamWriter, body: bytes):
+        writer.write(
+            (
+                "HTTP/1.1 200 OK\r\n"
+                f"{_CORS_HEADERS}"
+                "Content-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                "Connection: close\r\n"
+                "\r\n"
+            ).encode() + body
+        )
+
+    def _handle_add(self, data: dict):
+        # Media-heavy pages may batch several links into one /add call
+        urls = data.get('urls') or ([data['url']] if data.get('url') else [])
+        if not urls:
+            return
+        referer = data.get('referer', '')
+        filename = data.get('filename', '')
+        extra_headers = data.get('headers', {})
+        # Chrome's download API already knows the size — forward it out of
+        # band so the dialog can skip its probe round-trip. It must never
+        # ride inside extra_headers, which go out on the wire as-is.
+        known_size = int(data.get('fileSize') or data.get('size') or 0)
+
+        if self.add_dialog_callback:
+            for url in urls:
+                # Show add-download dialog in the UI thread
+                self.add_dialog_callback(url=url, filename=filename,
+                                         referer=referer,
+                                         extra_headers=extra_headers,
+                                         known_size=known_size)
+        elif self.queue_manager:
+            if len(urls) > 1:
+                # Batch path: probes run in parallel, one DB transaction
+                self.queue_manager.add_downloads(
+                    urls, referer=referer, extra_headers=extra_headers,
+                )
+            else:
+                self.queue_manager.add_download(
+                    url=urls[0],
+                    filename=filename or None,
+                    referer=referer,
+                    extra_headers=extra_headers,
+                    auto_start=True,
+                    size=known_size,
+                )
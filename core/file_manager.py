@@ -4,6 +4,7 @@ File Manager - Category detection, path management, duplicate handling
 import os
 import json
 import re
+import threading
 import urllib.parse
 from typing import Optional, Tuple
 
@@ -16,6 +17,37 @@ EXTENSION_CATEGORIES = {
     'Archives':  ['zip','rar','7z','tar','gz','bz2','xz','cab'],
 }
 
+# Inverted extension→category map built once so detection is a dict lookup
+_EXT_TO_CATEGORY = {ext: cat for cat, exts in EXTENSION_CATEGORIES.items() for ext in exts}
+
+# Hot-path regexes compiled at import instead of per call
+_RE_FNAME_RFC5987 = re.compile(r"filename\*=UTF-8''([^;\s]+)")
+_RE_FNAME_PLAIN = re.compile(r'filename=["\']?([^"\';\r\n]+)["\']?')
+
+# Fixed character class — a C-level translate table beats the regex engine
+_SANITIZE_TABLE = str.maketrans(
+    {c: '_' for c in '<>:"/\\|?*' + ''.join(chr(i) for i in range(0x20))})
+
+# Memo of the last inverted custom-category map. The Database hands out the
+# same cached list object between category edits, so an identity check hits
+# on every call against the current snapshot. Keeping a strong reference to
+# the source list is what makes the identity test safe: the list can't be
+# freed (and its id recycled by a new list) while it's the cached key.
+_custom_inverted: Optional[tuple] = None   # (categories_list, inverted_map)
+
+
+def _invert_custom(custom_categories: list) -> dict:
+    global _custom_inverted
+    cached = _custom_inverted
+    if cached is not None and cached[0] is custom_categories:
+        return cached[1]
+    inverted = {}
+    for cat in custom_categories:
+        for e in cat.get('extensions', []):
+            inverted.setdefault(e.lower(), cat['name'])
+    _custom_inverted = (custom_categories, inverted)
+    return inverted
+
 # Base download directory: user's Downloads folder / WITTGrp
 # Respect the setting from DB if available, otherwise use OS default
 _USER_DOWNLOADS = os.path.join(os.path.expanduser('~'), 'Downloads', 'WITTGrp')
@@ -26,13 +58,24 @@ def get_category(filename: str, custom_categories: Optional[list] = None) -> str
     """Detect file category from extension."""
     ext = os.path.splitext(filename)[1].lstrip('.').lower()
     if custom_categories:
-        for cat in custom_categories:
-            if ext in [e.lower() for e in cat.get('extensions', [])]:
-                return cat['name']
-    for category, exts in EXTENSION_CATEGORIES.items():
-        if ext in exts:
-            return category
-    return 'Other'
+        cat = _invert_custom(custom_categories).get(ext)
+        if cat:
+            return cat
+    return _EXT_TO_CATEGORY.get(ext, 'Other')
+
+
+# Folders we already created this process — skips the lstat chain makedirs
+# does on every call. isdir re-checks on hit to survive external deletion.
+_ensured_dirs: set = set()
+_ensured_lock = threading.Lock()
+
+
+def _ensure_dir(folder: str):
+    if folder in _ensured_dirs and os.path.isdir(folder):
+        return
+    os.makedirs(folder, exist_ok=True)
+    with _ensured_lock:
+        _ensured_dirs.add(folder)
 
 
 def get_save_path(filename: str, category: str, custom_categories: Optional[list] = None) -> str:
@@ -41,23 +84,31 @@ def get_save_path(filename: str, category: str, custom_categories: Optional[list
         for cat in custom_categories:
             if cat['name'] == category and cat.get('save_path'):
                 folder = cat['save_path']
-                os.makedirs(folder, exist_ok=True)
+                _ensure_dir(folder)
                 return ensure_unique(os.path.join(folder, filename))
 
     folder = os.path.join(BASE_DOWNLOAD_DIR, category)
-    os.makedirs(folder, exist_ok=True)
+    _ensure_dir(folder)
     return ensure_unique(os.path.join(folder, filename))
 
 
 def ensure_unique(filepath: str) -> str:
     """Append (1), (2), ... if file already exists."""
-    if not os.path.exists(filepath):
+    d, base = os.path.split(filepath)
+    if not os.path.isdir(d):
+        return filepath
+    # One directory scan instead of a stat syscall per candidate name
+    try:
+        existing = {e.name for e in os.scandir(d)}
+    except OSError:
+        existing = set()
+    if base not in existing:
         return filepath
-    root, ext = os.path.splitext(filepath)
+    root_base, ext = os.path.splitext(base)
     counter = 1
-    while os.path.exists(f"{root} ({counter}){ext}"):
+    while f"{root_base} ({counter}){ext}" in existing:
         counter += 1
-    return f"{root} ({counter}){ext}"
+    return os.path.join(d, f"{root_base} ({counter}){ext}")
 
 
 def _is_generic_name(name: str) -> bool:
@@ -93,10 +144,10 @@ def filename_from_url(url: str, content_disposition: Optional[str] = None, refer
     """Extract filename from URL, Content-Disposition header, or Referer."""
     # Try Content-Disposition first
     if content_disposition:
-        match = re.search(r"filename\*=UTF-8''([^;\s]+)", content_disposition)
+        match = _RE_FNAME_RFC5987.search(content_disposition)
         if match:
             return urllib.parse.unquote(match.group(1))
-        match = re.search(r'filename=["\']?([^"\';\r\n]+)["\']?', content_disposition)
+        match = _RE_FNAME_PLAIN.search(content_disposition)
         if match:
             return match.group(1).strip().strip('"\'')
 
@@ -156,25 +207,27 @@ def filename_from_url(url: str, content_disposition: Optional[str] = None, refer
 
 def sanitize_filename(name: str) -> str:
     """Remove invalid chars for Windows filenames."""
-    name = re.sub(r'[<>:"/\\|?*\x00-\x1f]', '_', name)
-    name = name.strip('. ')
+    name = name.translate(_SANITIZE_TABLE).strip('. ')
     return name[:200] if name else "download"
 
 
+_SIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB', 'PB')
+
+
 def format_size(size_bytes: int) -> str:
     """Human-readable file size."""
+    size_bytes = int(size_bytes)
     if size_bytes <= 0:
         return "Unknown"
-    for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
-        if size_bytes < 1024:
-            return f"{size_bytes:.1f} {unit}"
-        size_bytes /= 1024
-    return f"{size_bytes:.1f} PB"
+    # bit_length picks the 1024-power unit in O(1) — this runs on every
+    # progress tick for every active download, so no division loop
+    i = min((size_bytes.bit_length() - 1) // 10, len(_SIZE_UNITS) - 1)
+    return f"{size_bytes / (1 << (i * 10)):.1f} {_SIZE_UNITS[i]}"
 
 
 def format_speed(speed_bps: float) -> str:
     """Human-readable download speed."""
-    return format_size(int(speed_bps)) + "/s"
+    return format_size(speed_bps) + "/s"
 
 
 def format_eta(seconds: int) -> str:
@@ -3,6 +3,7 @@ Download Queue Manager - Controls concurrent downloads, priority, scheduling
 """
 import uuid
 import time
+import heapq
 import threading
 import logging
 from typing import Optional, Dict, Callable, List
@@ -53,12 +54,24 @@ class QueueManager:
         self.on_task_update = on_task_update  # fn(task: DownloadTask)
         self._tasks: Dict[str, DownloadTask] = {}
         self._lock = threading.RLock()
-        
+        # Task ids with unsaved progress; flushed to the DB once per second
+        self._dirty_tasks: set = set()
+        # Queued tasks as a heap of (-priority, added_at, id); removed ids are
+        # tombstoned and skipped lazily on pop instead of re-sorting the queue
+        self._queued_heap: list = []
+        self._queued_tombstones: set = set()
+        # Wakes the scheduler on state changes instead of a blind 2 s poll
+        self._cond = threading.Condition(self._lock)
+        # Maintained count of DOWNLOADING tasks — no O(N) walk per tick
+        self._n_active = 0
+
         self.global_token_bucket = TokenBucket(0)
         self._update_speed_limit()
-        
+
         self._scheduler_thread = threading.Thread(target=self._scheduler_loop, daemon=True)
         self._scheduler_thread.start()
+        self._flusher_thread = threading.Thread(target=self._progress_flush_loop, daemon=True)
+        self._flusher_thread.start()
 
     def _update_speed_limit(self):
         enabled = self.db.get_setting('speed_limit_enabled', 'false') == 'true'
@@ -80,11 +93,28 @@ class QueueManager:
         return int(self.db.get_setting('default_connections', '8'))
 
     def _active_count(self) -> int:
-        return sum(1 for t in self._tasks.values()
-                   if t.status == DownloadStatus.DOWNLOADING)
+        return self._n_active
+
+    def _track_status(self, task: 'DownloadTask', new_status: DownloadStatus):
+        """Set a task's status, keeping the active counter in sync."""
+        with self._lock:
+            was = task.status == DownloadStatus.DOWNLOADING
+            now = new_status == DownloadStatus.DOWNLOADING
+            self._n_active += int(now) - int(was)
+            task.status = new_status
+
+    def _wake_scheduler(self):
+        with self._cond:
+            self._cond.notify()
+
+    def _push_queued(self, task: 'DownloadTask'):
+        """Register a task that just became QUEUED. Caller holds the lock."""
+        self._queued_tombstones.discard(task.id)
+        heapq.heappush(self._queued_heap, (-task.priority, task.added_at, task.id))
 
     def load_from_db(self):
         """Load existing downloads from database on startup."""
+        stale_rows = []
         for row in self.db.get_all_downloads():
             task = DownloadTask(
                 task_id=row['id'],
@@ -105,8 +135,39 @@ class QueueManager:
             # Reset stale "Downloading" to "Paused" (was interrupted)
             if task.status == DownloadStatus.DOWNLOADING:
                 task.status = DownloadStatus.PAUSED
-                self.db.update_download(task.id, {'status': 'Paused'})
+                stale_rows.append((task.downloaded, task.total_size, 'Paused', task.id))
             self._tasks[task.id] = task
+            if task.status == DownloadStatus.QUEUED:
+                with self._lock:
+                    self._push_queued(task)
+        # One transaction for all interrupted rows instead of a commit each
+        if stale_rows:
+            self.db.update_progress_bulk(stale_rows)
+
+    def _dedupe_filepath(self, filepath: str, taken: Optional[set] = None) -> str:
+        """Suffix " (N)" until the path collides with neither the disk, the
+        queue, nor (when ``taken`` is given) paths assigned earlier in the
+        same batch. ensure_unique only sees files already on disk, so queued
+        tasks and intra-batch twins must be de-duped here."""
+        import os
+        import re
+
+        def in_queue(fp):
+            # Lock-free snapshot; a racing add is resolved by the DB unique path
+            return any(t.filepath == fp for t in list(self._tasks.values()))
+
+        root, ext = os.path.splitext(filepath)
+        # In case get_save_path already added " (1)", we want to group them gracefully
+        base_root = re.sub(r' \(\d+\)$', '', root)
+
+        counter = 1
+        while (os.path.exists(filepath) or in_queue(filepath)
+               or (taken is not None and filepath in taken)):
+            filepath = f"{base_root} ({counter}){ext}"
+            counter += 1
+        if taken is not None:
+            taken.add(filepath)
+        return filepath
 
     def add_download(self, url: str, filename: Optional[str] = None,
                      save_path: Optional[str] = None, connections: Optional[int] = None,
@@ -128,25 +189,11 @@ class QueueManager:
         else:
             fname = filename or filename_from_url(url, referer=referer)
 
-        category = get_category(fname, categories)
-        filepath = save_path or get_save_path(fname, category, categories)
-
         import os
-        import re
-        
-        def is_filepath_in_queue(fp):
-            with self._lock:
-                return any(t.filepath == fp for t in self._tasks.values())
 
-        root, ext = os.path.splitext(filepath)
-        # In case get_save_path already added " (1)", we want to group them gracefully
-        base_root = re.sub(r' \(\d+\)$', '', root)
-        
-        counter = 1
-        while os.path.exists(filepath) or is_filepath_in_queue(filepath):
-            filepath = f"{base_root} ({counter}){ext}"
-            counter += 1
-            
+        category = get_category(fname, categories)
+        filepath = save_path or get_save_path(fname, category, categories)
+        filepath = self._dedupe_filepath(filepath)
         fname = os.path.basename(filepath)
 
         task = DownloadTask(
@@ -165,6 +212,8 @@ class QueueManager:
 
         with self._lock:
             self._tasks[task_id] = task
+            self._push_queued(task)
+        self._wake_scheduler()
 
         self.db.add_download({
             'id': task_id, 'url': final_url, 'filename': fname,
@@ -181,20 +230,77 @@ class QueueManager:
 
         return task_id
 
+    def add_downloads(self, urls: List[str], referer: str = '',
+                      extra_headers: dict = None, auto_start: bool = True) -> List[str]:
+        """Add many downloads at once. Probes run in parallel and all rows
+        are committed in a single DB transaction. Returns the task ids."""
+        import json as _json
+        import os
+        from concurrent.futures import ThreadPoolExecutor
+
+        if not urls:
+            return []
+        probe_headers = {'Referer': referer} if referer else None
+        with ThreadPoolExecutor(max_workers=min(16, len(urls))) as pool:
+            results = list(pool.map(
+                lambda u: probe_url(u, dict(probe_headers) if probe_headers else None),
+                urls))
+
+        categories = self.db.get_categories()
+        task_ids, rows = [], []
+        batch_paths = set()
+        for url, (final_url, size, _, cd) in zip(urls, results):
+            task_id = str(uuid.uuid4())[:16]
+            fname = filename_from_url(final_url, cd, referer=referer)
+            category = get_category(fname, categories)
+            filepath = self._dedupe_filepath(
+                get_save_path(fname, category, categories), batch_paths)
+            fname = os.path.basename(filepath)
+
+            task = DownloadTask(
+                task_id=task_id,
+                url=final_url,
+                filename=fname,
+                filepath=filepath,
+                connections=self.default_connections,
+                referer=referer,
+                extra_headers=extra_headers or {},
+                category=category,
+            )
+            task.total_size = size
+            with self._lock:
+                self._tasks[task_id] = task
+                self._push_queued(task)
+            rows.append({
+                'id': task_id, 'url': final_url, 'filename': fname,
+                'filepath': filepath, 'size': size, 'downloaded': 0,
+                'status': 'Queued', 'category': category,
+                'connections': task.connections, 'speed_limit': 0,
+                'priority': task.priority, 'added_at': task.added_at,
+                'referer': referer, 'extra_headers': _json.dumps(extra_headers or {}),
+            })
+            task_ids.append(task_id)
+            self._notify(task)
+
+        self.db.add_downloads(rows)
+        if auto_start:
+            self._try_start_next()
+        return task_ids
+
     def _try_start_next(self):
-        """Start queued tasks if slots available."""
+        """Start queued tasks if slots available — O(log N) heap pops."""
         with self._lock:
             active = self._active_count()
-            if active >= self.max_concurrent:
-                return
-            # Sort by priority desc, then added_at asc
-            queued = sorted(
-                [t for t in self._tasks.values() if t.status == DownloadStatus.QUEUED],
-                key=lambda t: (-t.priority, t.added_at)
-            )
-            for task in queued:
-                if active >= self.max_concurrent:
-                    break
+            max_concurrent = self.max_concurrent
+            while active < max_concurrent and self._queued_heap:
+                _, _, task_id = heapq.heappop(self._queued_heap)
+                if task_id in self._queued_tombstones:
+                    self._queued_tombstones.discard(task_id)
+                    continue
+                task = self._tasks.get(task_id)
+                # Stale entry: the task was started/paused/removed since push
+                if not task or task.status != DownloadStatus.QUEUED:
+                    continue
                 self._start_task(task)
                 active += 1
 
@@ -207,10 +313,12 @@ class QueueManager:
             task.total_size = total
             task.speed = speed
             task.eta = eta
+            # Mark for the 1 Hz flusher instead of writing to the DB per tick
+            self._dirty_tasks.add(task.id)
             self._notify(task)
 
         def on_status(status: DownloadStatus):
-            task.status = status
+            self._track_status(task, status)
             if status == DownloadStatus.COMPLETED:
                 task.completed_at = time.time()
                 task.speed = 0
@@ -221,8 +329,10 @@ class QueueManager:
                     'completed_at': task.completed_at,
                 })
                 self._try_start_next()  # Start next queued item
+                self._wake_scheduler()
             elif status == DownloadStatus.ERROR:
                 self.db.update_download(task.id, {'status': 'Error', 'error_msg': task.error_msg})
+                self._wake_scheduler()
             elif status == DownloadStatus.PAUSED:
                 self.db.update_download(task.id, {
                     'status': 'Paused', 'downloaded': task.downloaded,
@@ -243,7 +353,7 @@ class QueueManager:
             token_bucket=self.global_token_bucket,
         )
         task._downloader = dl
-        task.status = DownloadStatus.DOWNLOADING
+        self._track_status(task, DownloadStatus.DOWNLOADING)
         self.db.update_download(task.id, {'status': 'Downloading', 'started_at': task.started_at})
         self._notify(task)
 
@@ -266,20 +376,23 @@ class QueueManager:
         if task.status == DownloadStatus.PAUSED:
             if task._downloader:
                 # Resume existing downloader without spawning a duplicate master thread
-                task.status = DownloadStatus.DOWNLOADING
-                self.db.update_download(task.id, {'status': 'Downloading'})
+                self._track_status(task, DownloadStatus.DOWNLOADING)
+                self.db.set_status(task.id, 'Downloading')
                 task._downloader.resume()
                 self._notify(task)
             else:
                 # Re-queue
-                task.status = DownloadStatus.QUEUED
+                self._track_status(task, DownloadStatus.QUEUED)
+                with self._lock:
+                    self._push_queued(task)
                 self._try_start_next()
+                self._wake_scheduler()
 
     def stop(self, task_id: str):
         task = self._tasks.get(task_id)
         if task and task._downloader:
             task._downloader.stop_and_save()
-            task.status = DownloadStatus.STOPPED
+            self._track_status(task, DownloadStatus.STOPPED)
             self.db.update_download(task.id, {'status': 'Stopped', 'downloaded': task.downloaded})
             self._notify(task)
 
@@ -291,29 +404,50 @@ class QueueManager:
             task._downloader.cancel()
         if delete_file:
             import os
-            if os.path.exists(task.filepath):
-                try:
-                    os.remove(task.filepath)
-                except Exception:
-                    pass
+            # EAFP: one syscall, no exists/remove race
+            try:
+                os.remove(task.filepath)
+            except OSError:
+                pass
         with self._lock:
-            self._tasks.pop(task_id, None)
+            popped = self._tasks.pop(task_id, None)
+            if popped and popped.status == DownloadStatus.DOWNLOADING:
+                self._n_active -= 1
+            self._queued_tombstones.add(task_id)
         self.db.delete_download(task_id)
 
     def start_all(self):
-        for task in list(self._tasks.values()):
-            if task.status in (DownloadStatus.QUEUED, DownloadStatus.PAUSED, DownloadStatus.STOPPED):
-                task.status = DownloadStatus.QUEUED
+        with self._lock:
+            for task in self._tasks.values():
+                if task.status in (DownloadStatus.QUEUED, DownloadStatus.PAUSED, DownloadStatus.STOPPED):
+                    self._track_status(task, DownloadStatus.QUEUED)
+                    self._push_queued(task)
         self._try_start_next()
 
     def stop_all(self):
-        for task in list(self._tasks.values()):
-            if task.status == DownloadStatus.DOWNLOADING:
-                self.stop(task.id)
+        from concurrent.futures import ThreadPoolExecutor
+        active = [t for t in list(self._tasks.values())
+                  if t.status == DownloadStatus.DOWNLOADING and t._downloader]
+        if not active:
+            return
+        # stop_and_save blocks on chunk-state flushes — overlap them, then
+        # persist every row in one transaction instead of a commit per task
+        with ThreadPoolExecutor(max_workers=len(active)) as ex:
+            list(ex.map(lambda t: t._downloader.stop_and_save(), active))
+        for task in active:
+            self._track_status(task, DownloadStatus.STOPPED)
+        try:
+            self.db.update_progress_bulk(
+                [(t.downloaded, t.total_size, 'Stopped', t.id) for t in active])
+        except Exception as e:
+            logger.error(f"Stop-all progress persist failed: {e}")
+        for task in active:
+            self._notify(task)
 
     def get_tasks(self) -> List[DownloadTask]:
-        with self._lock:
-            return list(self._tasks.values())
+        # list() takes an atomic snapshot under the GIL; the UI poll must never
+        # block on the scheduler lock (that is what the watchdog flags)
+        return list(self._tasks.values())
 
     def get_task(self, task_id: str) -> Optional[DownloadTask]:
         return self._tasks.get(task_id)
@@ -327,12 +461,13 @@ class QueueManager:
 
     def _check_schedule(self):
         """Check if we are within the user's allowed schedule."""
-        enabled = self.db.get_setting("schedule_enabled", "false") == "true"
-        if not enabled:
+        s = self.db.get_settings(
+            ["schedule_enabled", "schedule_start", "schedule_stop"])
+        if s.get("schedule_enabled", "false") != "true":
             return True, False
-            
-        start_str = self.db.get_setting("schedule_start", "00:00")
-        stop_str = self.db.get_setting("schedule_stop", "06:00")
+
+        start_str = s.get("schedule_start", "00:00")
+        stop_str = s.get("schedule_stop", "06:00")
         
         try:
             now = time.localtime()
@@ -364,7 +499,10 @@ class QueueManager:
         shutdown_triggered = False
         
         while True:
-            time.sleep(2)
+            # Timeout keeps the schedule window check ticking when idle;
+            # completions/additions notify for instant slot-filling
+            with self._cond:
+                self._cond.wait(timeout=2.0)
             self._update_speed_limit()
             
             # Check schedule
@@ -388,12 +526,20 @@ class QueueManager:
             # We are inside the schedule window (or schedule is disabled)
             shutdown_triggered = False
             self._try_start_next()
-            
-            # Persist progress for active downloads
-            for task in list(self._tasks.values()):
-                if task.status == DownloadStatus.DOWNLOADING:
-                    self.db.update_download(task.id, {
-                        'downloaded': task.downloaded,
-                        'size': task.total_size,
-                        'status': 'Downloading',
-                    })
+
+    def _progress_flush_loop(self):
+        """Batch accumulated progress into one DB transaction per second."""
+        while True:
+            time.sleep(1.0)
+            if not self._dirty_tasks:
+                continue
+            dirty, self._dirty_tasks = self._dirty_tasks, set()
+            rows = []
+            for task_id in dirty:
+                task = self._tasks.get(task_id)
+                if task and task.status == DownloadStatus.DOWNLOADING:
+                    rows.append((task.downloaded, task.total_size, 'Downloading', task_id))
+            try:
+                self.db.update_progress_bulk(rows)
+            except Exception as e:
+                logger.error(f"Progress flush failed: {e}")
@@ -19,6 +19,45 @@ logger = logging.getLogger(__name__)
 # Return type alias
 ProbeResult = Tuple[str, int, bool, str]
 
+# Case-insensitive scan beats allocating a lowercased copy of the header
+_RE_HTML = re.compile(r'text/html', re.I)
+# Total size from "Content-Range: bytes 0-0/12345"
+_RE_RANGE_TOTAL = re.compile(r'/(\d+)$')
+
+# Shared probe session — reuses TCP/TLS connections across probes instead of
+# paying a fresh handshake per requests.head/get call. Built lazily so merely
+# importing this module doesn't pull in requests.
+_SESSION = None
+
+
+def _get_session():
+    global _SESSION
+    if _SESSION is None:
+        import requests
+        from requests.adapters import HTTPAdapter, Retry
+        s = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=32, pool_maxsize=32,
+            max_retries=Retry(total=2, backoff_factor=0.1),
+        )
+        s.mount("https://", adapter)
+        s.mount("http://", adapter)
+        _SESSION = s
+    return _SESSION
+
+# yt-dlp is imported on first use only — it drags in ~80 modules and would
+# otherwise land on the splash-screen critical path via core.queue_manager.
+_YTDLP = None
+
+
+def _get_ytdlp():
+    global _YTDLP
+    if _YTDLP is None:
+        import yt_dlp
+        _YTDLP = yt_dlp
+    return _YTDLP
+
+
 _CHROME_UA = (
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
     "AppleWebKit/537.36 (KHTML, like Gecko) "
@@ -43,8 +82,8 @@ def _make_content_disposition(title: str, ext: str) -> str:
 # ─────────────────────────────────────────────────────────────────────────────
 class GenericHttpScraper:
     """
-    Sends a HEAD request; returns result only if the server responds with
-    a non-html Content-Type and a positive Content-Length.
+    Sends a single ranged GET; returns a result only if the server responds
+    with a non-html Content-Type and a positive size.
     """
 
     NAME = "GenericHTTP"
@@ -54,22 +93,31 @@ class GenericHttpScraper:
         return True  # last-resort, always eligible, checked last
 
     def probe(self, url: str, headers: dict = None) -> Optional[ProbeResult]:
-        import requests
         h = {"User-Agent": _CHROME_UA}
         if headers:
             h.update(headers)
+
+        # One ranged GET instead of HEAD: a 206 proves range support (HEAD's
+        # Accept-Ranges is unreliable on CDNs) and Content-Range carries the
+        # total size; a 200 still gives Content-Length/Type like HEAD would.
         try:
-            resp = requests.head(
-                url, headers=h, allow_redirects=True, timeout=12, verify=False
+            resp = _get_session().get(
+                url, headers={**h, "Range": "bytes=0-0"}, stream=True,
+                allow_redirects=True, timeout=12, verify=False,
             )
-            ct = resp.headers.get("Content-Type", "").lower()
-            size = int(resp.headers.get("Content-Length", 0))
-            accepts = resp.headers.get("Accept-Ranges", "").lower() == "bytes"
+            resp.close()  # headers only — at most one body byte was queued
+            ct = resp.headers.get("Content-Type", "")
             cd = resp.headers.get("Content-Disposition", "")
+            accepts = resp.status_code == 206
+            if accepts:
+                m = _RE_RANGE_TOTAL.search(resp.headers.get("Content-Range", ""))
+                size = int(m.group(1)) if m else 0
+            else:
+                size = int(resp.headers.get("Content-Length", 0))
 
-            if size > 0 and "text/html" not in ct:
+            if size > 0 and not _RE_HTML.search(ct):
                 logger.info(f"[GenericHTTP] Direct file: {size} bytes, ct={ct!r}")
-                # For YouTube CDN URLs (googlevideo.com), HEAD works but no Content-Disposition.
+                # For YouTube CDN URLs (googlevideo.com), the probe works but no Content-Disposition.
                 # Extract size from the clen= query param which is always present in signed URLs.
                 final_domain = urllib.parse.urlparse(resp.url).netloc.lower()
                 if "googlevideo.com" in final_domain and not cd:
@@ -80,9 +128,9 @@ class GenericHttpScraper:
                     return resp.url, clen or size, True, cd
                 return resp.url, size, accepts, cd
         except Exception as e:
-            logger.debug(f"[GenericHTTP] HEAD failed: {e}")
+            logger.debug(f"[GenericHTTP] probe failed: {e}")
 
-        # For YouTube CDN URLs that fail HEAD, try extracting size from the clen= param in URL
+        # For YouTube CDN URLs that fail the probe, try extracting size from the clen= param in URL
         parsed_qs = urllib.parse.parse_qs(urllib.parse.urlparse(url).query)
         if "googlevideo.com" in urllib.parse.urlparse(url).netloc.lower() and "clen" in parsed_qs:
             clen = int(parsed_qs["clen"][0])
@@ -146,7 +194,7 @@ class YouTubeScraper:
 
     def probe(self, url: str, headers: dict = None) -> Optional[ProbeResult]:
         try:
-            import yt_dlp
+            yt_dlp = _get_ytdlp()
         except ImportError:
             logger.error("[YouTube] yt-dlp not installed")
             return None
@@ -256,7 +304,7 @@ class YtDlpScraper:
 
     def probe(self, url: str, headers: dict = None) -> Optional[ProbeResult]:
         try:
-            import yt_dlp
+            yt_dlp = _get_ytdlp()
         except ImportError:
             logger.error("[yt-dlp] not installed")
             return None
@@ -309,7 +357,6 @@ class XVideosScraper:
         return "xvideos" in domain
 
     def probe(self, url: str, headers: dict = None) -> Optional[ProbeResult]:
-        import requests
         logger.info(f"[XVideos] Probing: {url}")
         try:
             req = urllib.request.Request(
@@ -344,7 +391,7 @@ class XVideosScraper:
             size = 0
             try:
                 h = {"User-Agent": _CHROME_UA, "Referer": url}
-                head_resp = requests.head(best_vid, headers=h, timeout=10, verify=False, allow_redirects=True)
+                head_resp = _get_session().head(best_vid, headers=h, timeout=10, verify=False, allow_redirects=True)
                 size = int(head_resp.headers.get("Content-Length", 0))
             except Exception:
                 pass
@@ -382,7 +429,6 @@ class XHamsterScraper:
         return "xhamster" in domain
 
     def probe(self, url: str, headers: dict = None) -> Optional[ProbeResult]:
-        import requests
         logger.info(f"[xHamster] Probing: {url}")
         try:
             req = urllib.request.Request(
@@ -413,7 +459,7 @@ class XHamsterScraper:
             size = 0
             try:
                 h = {"User-Agent": _CHROME_UA, "Referer": url}
-                head_resp = requests.head(best_vid, headers=h, timeout=10, verify=False, allow_redirects=True)
+                head_resp = _get_session().head(best_vid, headers=h, timeout=10, verify=False, allow_redirects=True)
                 size = int(head_resp.headers.get("Content-Length", 0))
             except Exception:
                 pass
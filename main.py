@@ -10,37 +10,87 @@ import threading
 import time
 warnings.filterwarnings('ignore')
 
-# Setup logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s [%(levelname)s] %(name)s: %(message)s',
-    handlers=[
-        logging.FileHandler('idm.log', encoding='utf-8'),
-        logging.StreamHandler(sys.stdout),
-    ]
-)
+# Setup logging — handlers run on a QueueListener thread so log calls from
+# download workers and chunk callbacks never block on file/console writes
+import atexit
+import queue as _queue
+from logging.handlers import QueueHandler, QueueListener
+
+class BufferedFileHandler(logging.FileHandler):
+    """FileHandler with a 64 KiB stream buffer that only flushes on
+    WARNING+ records or every 30 s — INFO spam stays in the buffer."""
+
+    _FLUSH_INTERVAL = 30.0
+
+    def _open(self):
+        return open(self.baseFilename, self.mode, buffering=65536,
+                    encoding=self.encoding)
+
+    def emit(self, record):
+        try:
+            if self.stream is None:
+                self.stream = self._open()
+            self.stream.write(self.format(record) + self.terminator)
+            now = time.monotonic()
+            if (record.levelno >= logging.WARNING
+                    or now - getattr(self, '_last_flush', 0.0) >= self._FLUSH_INTERVAL):
+                self.flush()
+                self._last_flush = now
+        except Exception:
+            self.handleError(record)
+
+
+_log_queue = _queue.Queue(-1)
+_log_fmt = logging.Formatter('%(asctime)s [%(levelname)s] %(name)s: %(message)s')
+_file_handler = BufferedFileHandler('idm.log', encoding='utf-8')
+_file_handler.setFormatter(_log_fmt)
+_stream_handler = logging.StreamHandler(sys.stdout)
+_stream_handler.setFormatter(_log_fmt)
+logging.basicConfig(level=logging.INFO, handlers=[QueueHandler(_log_queue)])
+_log_listener = QueueListener(
+    _log_queue, _file_handler, _stream_handler, respect_handler_level=True)
+_log_listener.start()
+atexit.register(_log_listener.stop)
 logger = logging.getLogger('WITTGrp')
 
 # Add project root to path
 sys.path.insert(0, os.path.dirname(__file__))
 
 from PyQt6.QtWidgets import QApplication, QSplashScreen, QLabel
-from PyQt6.QtCore import Qt, QTimer, QThread
-from PyQt6.QtGui import QFont, QPixmap, QPainter, QColor, QLinearGradient
+from PyQt6.QtCore import Qt, QTimer, QThread, pyqtSignal
+from PyQt6.QtGui import QFont, QPixmap, QPainter, QColor, QLinearGradient, QImage
 
 from core.database import Database
 from core.queue_manager import QueueManager
 from core.extension_server import ExtensionServer
 from ui.main_window import MainWindow
-from ui.stylesheet import STYLESHEET
+from ui.stylesheet import apply_global_stylesheet
+
+
+# Rendered splash cached on first run — later launches decode one PNG
+# instead of re-running every gradient/font/text QPainter call
+_SPLASH_CACHE = os.path.join(os.path.dirname(__file__), 'ui', 'assets', 'splash.png')
+
+# Font objects hoisted so Qt's font-matching runs once per process, not per
+# paint call on the splash fallback path
+_F_ICON = QFont("Segoe UI", 38, QFont.Weight.Bold)
+_F_TITLE = QFont("Segoe UI", 30, QFont.Weight.Bold)
+_F_SUB = QFont("Segoe UI", 12)
+_F_TINY = QFont("Segoe UI", 10)
+_F_BAR = QFont("Segoe UI", 10, QFont.Weight.Bold)
 
 
 def create_splash_screen(app: QApplication) -> QSplashScreen:
     """Create a modern, clean splash screen with no overlapping elements."""
+    pix = QPixmap(_SPLASH_CACHE)
+    if not pix.isNull():
+        return QSplashScreen(pix, Qt.WindowType.WindowStaysOnTopHint)
+
     W, H = 520, 290
-    pix = QPixmap(W, H)
-    pix.fill(Qt.GlobalColor.transparent)
-    painter = QPainter(pix)
+    # Premultiplied ARGB is Qt's fast path for alpha compositing
+    img = QImage(W, H, QImage.Format.Format_ARGB32_Premultiplied)
+    img.fill(Qt.GlobalColor.transparent)
+    painter = QPainter(img)
     painter.setRenderHint(QPainter.RenderHint.Antialiasing)
 
     # ── Background ──────────────────────────────────────────────
@@ -60,8 +110,7 @@ def create_splash_screen(app: QApplication) -> QSplashScreen:
     painter.drawRoundedRect(icon_x, icon_y, icon_size, icon_size, 14, 14)
 
     painter.setPen(QColor("#ffffff"))
-    f_icon = QFont("Segoe UI", 38, QFont.Weight.Bold)
-    painter.setFont(f_icon)
+    painter.setFont(_F_ICON)
     # Center the arrow inside the box
     painter.drawText(
         icon_x, icon_y + 6, icon_size, icon_size,
@@ -74,29 +123,35 @@ def create_splash_screen(app: QApplication) -> QSplashScreen:
 
     # App name
     painter.setPen(QColor("#ffffff"))
-    painter.setFont(QFont("Segoe UI", 30, QFont.Weight.Bold))
+    painter.setFont(_F_TITLE)
     painter.drawText(tx, ty + 36, "WITTGrp")
 
     # Subtitle
     painter.setPen(QColor("#47A1FF"))
-    painter.setFont(QFont("Segoe UI", 12))
+    painter.setFont(_F_SUB)
     painter.drawText(tx, ty + 60, "Download Manager")
 
     # Tagline
     painter.setPen(QColor("#5a6a80"))
-    painter.setFont(QFont("Segoe UI", 10))
+    painter.setFont(_F_TINY)
     painter.drawText(tx, ty + 82, "Multi-threaded  •  Resumable  •  Fast")
 
     # ── Bottom status bar ───────────────────────────────────────
     painter.fillRect(0, H - 36, W, 36, QColor("#0d0e18"))
     painter.setPen(QColor("#47A1FF"))
-    painter.setFont(QFont("Segoe UI", 10, QFont.Weight.Bold))
+    painter.setFont(_F_BAR)
     painter.drawText(20, H - 10, "Loading…")
     painter.setPen(QColor("#3b4252"))
-    painter.setFont(QFont("Segoe UI", 10))
+    painter.setFont(_F_TINY)
     painter.drawText(W - 60, H - 10, "v1.0.0")
 
     painter.end()
+    pix = QPixmap.fromImage(img)
+
+    try:
+        pix.save(_SPLASH_CACHE, 'PNG')
+    except Exception:
+        pass  # cache miss next run, nothing worse
 
     splash = QSplashScreen(pix, Qt.WindowType.WindowStaysOnTopHint)
     return splash
@@ -111,41 +166,52 @@ def main():
     app.setApplicationName("WITTGrp Download Manage")
     app.setOrganizationName("WITTGrp")
     app.setApplicationVersion("1.0.0")
-    app.setStyleSheet(STYLESHEET)
+    apply_global_stylesheet(app)
     app.setQuitOnLastWindowClosed(False)
 
     # Splash screen
     splash = create_splash_screen(app)
     splash.show()
     app.processEvents()
-
-    # Initialize database
-    #splash.showMessage("  Initializing database…", Qt.AlignmentFlag.AlignBottom | Qt.AlignmentFlag.AlignLeft, QColor("#e94560"))
-    app.processEvents()
-    db = Database()
-
-    # Initialize queue manager
-    #splash.showMessage("  Starting download engine…", Qt.AlignmentFlag.AlignBottom | Qt.AlignmentFlag.AlignLeft, QColor("#e94560"))
-    app.processEvents()
-    queue = QueueManager(db=db)
-    queue.load_from_db()
-
-    # Start extension server
-    #splash.showMessage("  Starting browser integration server…", Qt.AlignmentFlag.AlignBottom | Qt.AlignmentFlag.AlignLeft, QColor("#e94560"))
-    app.processEvents()
-    port = int(db.get_setting('extension_server_port', '9614'))
-
-    # Create main window (need it for the dialog callback)
-    #splash.showMessage("  Loading interface…", Qt.AlignmentFlag.AlignBottom | Qt.AlignmentFlag.AlignLeft, QColor("#e94560"))
-    app.processEvents()
-    window = MainWindow(queue_manager=queue, db=db)
-
-    ext_server = ExtensionServer(
-        port=port,
-        queue_manager=queue,
-        add_dialog_callback=lambda *args: window.add_url_signal.emit(args[-4], args[-3], args[-2], args[-1])
-    )
-    ext_server.start()
+    t0 = time.monotonic()
+
+    # DB open + queue restore run on a worker thread so the splash delay is
+    # the only wall-clock gate; the window is assembled once data is ready
+    class StartupLoader(QThread):
+        loaded = pyqtSignal(object, object)
+
+        def run(self):
+            db = Database()
+            queue = QueueManager(db=db)
+            queue.load_from_db()
+            self.loaded.emit(db, queue)
+
+    # Keep loader/window/server referenced for the app's lifetime
+    refs = {}
+
+    def _assemble(db, queue):
+        port = int(db.get_setting('extension_server_port', '9614'))
+
+        # Create main window (need it for the dialog callback)
+        window = MainWindow(queue_manager=queue, db=db)
+
+        ext_server = ExtensionServer(
+            port=port,
+            queue_manager=queue,
+            add_dialog_callback=window._emit_add_url,
+        )
+        ext_server.start()
+        refs['window'] = window
+        refs['ext_server'] = ext_server
+
+        # 1800 ms is now a minimum-display floor, not an added delay
+        remaining = max(0, 1800 - int((time.monotonic() - t0) * 1000))
+        QTimer.singleShot(remaining, lambda: (splash.finish(window), window.show()))
+
+    loader = StartupLoader()
+    loader.loaded.connect(_assemble)
+    loader.start()
+    refs['loader'] = loader
 
     # Watchdog thread to catch UI freezes
     main_thread_id = threading.get_ident()
@@ -159,22 +225,23 @@ def main():
     ui_timer.timeout.connect(_ui_heartbeat)
     ui_timer.start(500)
 
+    # Event instead of sleep: quitting wakes the thread immediately, and a
+    # wedged UI thread still gets caught (QTimers stop firing, Event doesn't)
+    _watchdog_stop = threading.Event()
+
     def _watchdog():
         import traceback, sys
-        while True:
-            time.sleep(2)
+        while not _watchdog_stop.wait(2.0):
             if time.time() - _ui_alive_time > 3.0:
                 with open('freeze_dump.txt', 'a') as f:
                     f.write(f"\n--- UI THREAD DEADLOCK DETECTED AT {time.ctime()} ---\n")
                     frame = sys._current_frames().get(main_thread_id)
                     if frame:
                         traceback.print_stack(frame, file=f)
-                time.sleep(10) # Wait before dumping again
+                _watchdog_stop.wait(10)  # Wait before dumping again
 
     threading.Thread(target=_watchdog, daemon=True).start()
-
-    # Show main window
-    QTimer.singleShot(1800, lambda: (splash.finish(window), window.show()))
+    app.aboutToQuit.connect(_watchdog_stop.set)
 
     logger.info("WITTGrp started successfully")
     sys.exit(app.exec())
@@ -3,31 +3,86 @@ Add Download Dialog - URL input, filename, save path, connections
 """
 import os
 import threading
+import urllib.parse
 from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit,
     QPushButton, QFileDialog, QSpinBox, QComboBox, QCheckBox,
-    QGroupBox, QFormLayout, QProgressBar, QWidget
+    QGroupBox, QFormLayout, QProgressBar, QWidget, QApplication
 )
 from PyQt6.QtCore import Qt, pyqtSignal, QThread, QTimer
 from PyQt6.QtGui import QFont, QIcon
-from core.file_manager import filename_from_url, probe_url, get_category, format_size
+from core.file_manager import (
+    filename_from_url, probe_url, get_category, format_size, get_save_path,
+)
 from ui.titlebar import CustomTitleBar
 
 SVG_DIR = os.path.join(os.path.dirname(__file__), "assets", "svg")
+# Resolved once — expanduser hits the environment on every call.
+# join instead of "~\\Downloads" so the path also expands on POSIX.
+DEFAULT_DOWNLOADS = os.path.join(os.path.expanduser("~"), "Downloads")
+
+# Probe results cached per (url, referer) for a minute — paste/edit/re-paste
+# patterns and dialog re-opens hit the network once, not per keystroke burst
+_PROBE_TTL = 60.0
+_probe_cache: dict = {}
+
+
+def cached_probe(url: str, referer: str = ''):
+    import time
+    key = (url, referer)
+    hit = _probe_cache.get(key)
+    now = time.monotonic()
+    if hit and now - hit[1] < _PROBE_TTL:
+        return hit[0]
+    headers = {'Referer': referer} if referer else {}
+    result = probe_url(url, headers)
+    if len(_probe_cache) > 64:
+        _probe_cache.clear()
+    _probe_cache[key] = (result, now)
+    return result
+
+
+def invalidate_probe(url: str, referer: str = ''):
+    """Drop a cached probe so the next lookup hits the network again."""
+    _probe_cache.pop((url, referer), None)
+
+
+class ProbeWorker(QThread):
+    """Singleton worker thread that serves all dialog probes.
 
+    One long-lived thread fed through a queue replaces a fresh QThread per
+    probe; the pooled scraper session then reuses its TCP/TLS connections
+    across successive probes too.
+    """
 
-class ProbeThread(QThread):
-    result = pyqtSignal(str, int, bool, str)  # final_url, size, accepts_ranges, content_disposition
+    # probed_url, final_url, size, accepts_ranges, content_disposition
+    result = pyqtSignal(str, str, int, bool, str)
 
-    def __init__(self, url, referer=''):
+    _instance = None
+
+    @classmethod
+    def instance(cls) -> 'ProbeWorker':
+        if cls._instance is None:
+            cls._instance = cls()
+            cls._instance.start()
+        return cls._instance
+
+    def __init__(self):
         super().__init__()
-        self.url = url
-        self.referer = referer
+        import queue
+        self._q = queue.Queue()
+
+    def enqueue(self, url: str, referer: str = ''):
+        self._q.put((url, referer))
 
     def run(self):
-        headers = {'Referer': self.referer} if self.referer else {}
-        final_url, size, accepts, cd = probe_url(self.url, headers)
-        self.result.emit(final_url, size, accepts, cd)
+        while True:
+            url, referer = self._q.get()
+            try:
+                final_url, size, accepts, cd = cached_probe(url, referer)
+            except Exception:
+                final_url, size, accepts, cd = url, 0, False, ''
+            self.result.emit(url, final_url, size, accepts, cd)
 
 
 class AddDownloadDialog(QDialog):
@@ -37,14 +92,7 @@ class AddDownloadDialog(QDialog):
                  referer: str = '', extra_headers: dict = None,
                  categories: list = None, db=None):
         super().__init__(parent)
-        self.categories = categories or []
         self.db = db
-        self.extra_headers = extra_headers or {}
-        self._probe_thread = None
-        self._auto_probe_done = False   # True after ANY probe fires (blocks timer re-fire only)
-        self._probe_in_progress = False  # True while yt-dlp is running
-        self._probed_size = 0
-        self._original_url = url        # Keep the original YouTube/page URL
 
         self.setWindowTitle("Add New Download")
         self.setMinimumSize(580, 520)
@@ -55,37 +103,106 @@ class AddDownloadDialog(QDialog):
         self._typing_timer.setSingleShot(True)
         self._typing_timer.timeout.connect(self._probe_url)
 
+        # Debounce per-keystroke handlers: the work runs once per pause,
+        # not once per character
+        self._url_debounce = QTimer(self)
+        self._url_debounce.setSingleShot(True)
+        self._url_debounce.setInterval(150)
+        self._url_debounce.timeout.connect(self._apply_url_change)
+        self._fname_debounce = QTimer(self)
+        self._fname_debounce.setSingleShot(True)
+        self._fname_debounce.setInterval(150)
+        self._fname_debounce.timeout.connect(self._apply_filename_change)
+
         self._build_ui()
+        self._connect_signals()
+        self.finished.connect(self._disconnect_probe_worker)
+
+        self.reset(url=url, filename=filename, referer=referer,
+                   extra_headers=extra_headers, categories=categories or [])
+
+    def reset(self, url: str = '', filename: str = '', referer: str = '',
+              extra_headers: dict = None, known_size: int = 0,
+              categories: list = None):
+        """(Re-)initialise per-open state.
+
+        Widgets, layouts and timers are built once in __init__; the main
+        window keeps a single instance alive and calls this before each
+        exec() instead of constructing a fresh dialog per open.
+        """
+        self.categories = categories if categories is not None else self.categories
+        # One-time maps: category name → save path, and the combo entries
+        self._cat_path = {c['name']: c['save_path'] for c in self.categories
+                          if c.get('save_path')}
+        self._cat_names = [c['name'] for c in self.categories] or \
+            ['Videos', 'Music', 'Documents', 'Programs', 'Archives', 'Other']
+        self._cat_idx = {name: i for i, name in enumerate(self._cat_names)}
+        self.extra_headers = extra_headers or {}
+        # Size forwarded by the browser extension — lets us skip the
+        # auto-probe below
+        self._known_size = int(known_size or 0)
+        self._probe_target_url = None
+        self._last_probed_key = None    # (scheme, netloc, path) of last probe
+        self._last_cat_ext = None
+        self._auto_probe_done = False   # True after ANY probe fires (blocks timer re-fire only)
+        self._probed_size = 0
+        self._original_url = url        # Keep the original YouTube/page URL
 
-        # Set initial values with signals BLOCKED so we don't trigger premature probes
+        self._typing_timer.stop()
+        self._url_debounce.stop()
+        self._fname_debounce.stop()
+
+        # Set values with signals BLOCKED so we don't trigger premature probes
+        self.category_combo.blockSignals(True)
         self.url_edit.blockSignals(True)
         self.filename_edit.blockSignals(True)
-        if url:
-            self.url_edit.setText(url)
+        self.category_combo.clear()
+        self.category_combo.addItems(self._cat_names)
+        self.url_edit.setText(url)
+        self.filename_edit.setText(filename)
+        self.referer_edit.setText(referer)
+        self._referer_cached = referer.strip()
+        self.save_path_edit.clear()
+        self.size_label.setText("Unknown")
+        self.probe_status.setText("")
         if filename:
-            self.filename_edit.setText(filename)
             self._auto_probe_done = True  # filename supplied — no need to probe
             # Explicitly resolve the category for the pre-filled filename
             cat = get_category(filename, self.categories)
-            idx = self.category_combo.findText(cat)
+            idx = self._cat_idx.get(cat, -1)
             if idx >= 0:
                 self.category_combo.setCurrentIndex(idx)
-        if referer:
-            self.referer_edit.setText(referer)
+        self.category_combo.blockSignals(False)
         self.url_edit.blockSignals(False)
         self.filename_edit.blockSignals(False)
 
-        # Now connect signals (AFTER initial values are set)
-        self._connect_signals()
+        # Reconnect the shared worker (finished() disconnects on close)
+        self._disconnect_probe_worker()
+        ProbeWorker.instance().result.connect(self._on_probe_result)
 
         # Set initial save path
         self._refresh_save_path()
 
-        # If we have a URL but no filename yet, kick off the probe once
-        if url and not filename:
+        # If the extension already told us the size, show it and skip the
+        # probe entirely — "Detect Info" still works for a manual re-check
+        if self._known_size > 0:
+            self._probed_size = self._known_size
+            self.size_label.setText(format_size(self._known_size))
+            self._auto_probe_done = True
+        elif url and not filename:
+            # URL but no filename yet — kick off the probe once
             self._typing_timer.start(400)  # short delay to let the dialog render first
 
 
+    def _cache_referer(self):
+        self._referer_cached = self.referer_edit.text().strip()
+
+    def _disconnect_probe_worker(self):
+        try:
+            ProbeWorker.instance().result.disconnect(self._on_probe_result)
+        except TypeError:
+            pass  # already disconnected
+
     def _build_ui(self):
         layout = QVBoxLayout(self)
         layout.setSpacing(10)
@@ -95,15 +212,12 @@ class AddDownloadDialog(QDialog):
         hdr = QHBoxLayout()
         hdr.setSpacing(8)
         icon_lbl = QLabel("⬇")
+        icon_lbl.setObjectName("header_icon")
         icon_lbl.setFixedSize(28, 28)
         icon_lbl.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        icon_lbl.setStyleSheet(
-            "background:#0A84FF; color:#fff; border-radius:6px;"
-            "font-size:14px; font-weight:700;"
-        )
         title_lbl = QLabel("Add New Download")
+        title_lbl.setObjectName("header_title")
         title_lbl.setFont(QFont("Segoe UI", 15, QFont.Weight.Bold))
-        title_lbl.setStyleSheet("color:#0A84FF;")
         hdr.addWidget(icon_lbl)
         hdr.addWidget(title_lbl)
         hdr.addStretch()
@@ -151,10 +265,7 @@ class AddDownloadDialog(QDialog):
         self.size_label.setObjectName("subtitle_label")
         file_fl.addRow("Size:", self.size_label)
 
-        self.category_combo = QComboBox()
-        cat_names = [c['name'] for c in self.categories] if self.categories else \
-            ['Videos', 'Music', 'Documents', 'Programs', 'Archives', 'Other']
-        self.category_combo.addItems(cat_names)
+        self.category_combo = QComboBox()  # populated in reset()
         file_fl.addRow("Category:", self.category_combo)
 
         save_row = QHBoxLayout()
@@ -217,6 +328,8 @@ class AddDownloadDialog(QDialog):
         self.ok_btn.clicked.connect(self._accept)
         self.url_edit.textChanged.connect(self._on_url_changed)
         self.filename_edit.textChanged.connect(self._on_filename_changed)
+        # Strip once when the user leaves the field, not on every probe
+        self.referer_edit.editingFinished.connect(self._cache_referer)
         self.category_combo.currentTextChanged.connect(self._on_category_changed)
         self.speed_check.toggled.connect(self.speed_spin.setEnabled)
 
@@ -224,15 +337,18 @@ class AddDownloadDialog(QDialog):
         # User changed URL manually — reset auto-probe state
         self._auto_probe_done = False
         self._original_url = text
+        self._url_debounce.start()
 
+    def _apply_url_change(self):
+        text = self.url_edit.text()
         # Only auto-fill filename from URL if it has a proper extension (e.g. file.mp4)
         if text and not self.filename_edit.text():
-            name = filename_from_url(text, referer=self.referer_edit.text().strip())
+            name = filename_from_url(text, referer=self._referer_cached)
             if name and '.' in name:
                 self.filename_edit.blockSignals(True)
                 self.filename_edit.setText(name)
                 self.filename_edit.blockSignals(False)
-                self._on_filename_changed(name)
+                self._apply_filename_change(name)
 
         # Auto-probe 800 ms after the user stops typing
         if text.strip().startswith('http'):
@@ -241,14 +357,27 @@ class AddDownloadDialog(QDialog):
             self._typing_timer.stop()
 
     def _on_filename_changed(self, name):
+        self._fname_debounce.start()
+
+    def _apply_filename_change(self, name=None):
+        if name is None:
+            name = self.filename_edit.text()
+        # Category is a function of the extension; skip the lookup and combo
+        # scan entirely while the user edits the stem
+        ext = os.path.splitext(name)[1].lower()
+        if ext and ext == self._last_cat_ext:
+            self._refresh_save_path()
+            return
+        self._last_cat_ext = ext
         cat = get_category(name, self.categories)
-        idx = self.category_combo.findText(cat)
-        if idx >= 0:
-            if self.category_combo.currentIndex() == idx:
-                # Same category, but filename changed - must refresh path manually
-                self._refresh_save_path()
-            else:
-                self.category_combo.setCurrentIndex(idx)
+        idx = self._cat_idx.get(cat, -1)
+        if idx >= 0 and self.category_combo.currentIndex() != idx:
+            # Select silently — the single refresh below replaces the
+            # currentTextChanged → _on_category_changed cascade
+            self.category_combo.blockSignals(True)
+            self.category_combo.setCurrentIndex(idx)
+            self.category_combo.blockSignals(False)
+        self._refresh_save_path()
 
     def _on_category_changed(self, cat_name):
         self._refresh_save_path()
@@ -259,33 +388,41 @@ class AddDownloadDialog(QDialog):
         if not fname:
             fname = "download" # placeholder until detected
 
-        for c in self.categories:
-            if c['name'] == cat_name:
-                self.save_path_edit.setText(os.path.join(c['save_path'], fname))
-                break
+        path = self._cat_path.get(cat_name)
+        if path:
+            self.save_path_edit.setText(os.path.join(path, fname))
 
     def _probe_url(self):
         url = self.url_edit.text().strip()
         if not url or not url.startswith('http'):
             return
-        if self._probe_in_progress:
-            return  # Already probing, don't start another
-        if self._auto_probe_done and not self.probe_btn.isEnabled():
-            return  # Guard: timer re-fire while probe in progress
+        # No in-flight guard: a newer target simply supersedes the old one \u2014
+        # _on_probe_result drops replies whose URL no longer matches, so the
+        # user never waits out a slow probe of a URL they already replaced
         self._auto_probe_done = True    # Block the 800ms timer from firing again
-        self._probe_in_progress = True
         self.probe_status.setText("\u231b Detecting file info\u2026")
-        self.probe_btn.setEnabled(False)
         # Always probe the original URL, not a CDN redirect
         probe_target = self._original_url or url
-        referer = self.referer_edit.text().strip()
-        self._probe_thread = ProbeThread(probe_target, referer)
-        self._probe_thread.result.connect(self._on_probe_result)
-        self._probe_thread.start()
-
-    def _on_probe_result(self, final_url, size, accepts_ranges, content_disposition):
-        self._probe_in_progress = False
-        self.probe_btn.setEnabled(True)
+        referer = self._referer_cached
+        # Shift+click on Detect Info bypasses the probe cache
+        force = bool(QApplication.keyboardModifiers()
+                     & Qt.KeyboardModifier.ShiftModifier)
+        if force:
+            invalidate_probe(probe_target, referer)
+        # Query-string tweaks rarely change the response headers — if the
+        # scheme/host/path match the last probe and we already have a size,
+        # skip the round-trip entirely
+        key = urllib.parse.urlsplit(probe_target)[:3]
+        if not force and key == self._last_probed_key and self._probed_size > 0:
+            self.probe_status.setText("✓ File info detected")
+            return
+        self._last_probed_key = key
+        self._probe_target_url = probe_target
+        ProbeWorker.instance().enqueue(probe_target, referer)
+
+    def _on_probe_result(self, probed_url, final_url, size, accepts_ranges, content_disposition):
+        if probed_url != self._probe_target_url:
+            return  # reply for an URL this dialog is no longer interested in
         self._typing_timer.stop()    # Stop any pending timer re-fire
 
         # Update URL field to CDN URL WITHOUT triggering _on_url_changed
@@ -295,12 +432,12 @@ class AddDownloadDialog(QDialog):
             self.url_edit.blockSignals(False)
 
         # Extract filename: use _original_url for YouTube-style page URLs
-        name = filename_from_url(self._original_url or final_url, content_disposition, referer=self.referer_edit.text().strip())
+        name = filename_from_url(self._original_url or final_url, content_disposition, referer=self._referer_cached)
         if name and name != self.filename_edit.text():
             self.filename_edit.blockSignals(True)
             self.filename_edit.setText(name)
             self.filename_edit.blockSignals(False)
-            self._on_filename_changed(name)
+            self._apply_filename_change(name)
 
         if size > 0:
             self._probed_size = size
@@ -316,7 +453,7 @@ class AddDownloadDialog(QDialog):
 
     def _browse_save_path(self):
         fname = self.filename_edit.text() or "download"
-        current = self.save_path_edit.text() or os.path.expanduser("~\\Downloads")
+        current = self.save_path_edit.text() or DEFAULT_DOWNLOADS
         folder = QFileDialog.getExistingDirectory(self, "Select Save Folder", current)
         if folder:
             self.save_path_edit.setText(os.path.join(folder, fname))
@@ -326,11 +463,10 @@ class AddDownloadDialog(QDialog):
         if not url:
             self.url_edit.setFocus()
             return
-        filename = self.filename_edit.text().strip() or filename_from_url(url, referer=self.referer_edit.text().strip())
+        filename = self.filename_edit.text().strip() or filename_from_url(url, referer=self._referer_cached)
         save_path = self.save_path_edit.text().strip()
         if not save_path:
             cat = self.category_combo.currentText()
-            from core.file_manager import get_save_path
             save_path = get_save_path(filename, cat, self.categories)
 
         params = {
@@ -339,7 +475,7 @@ class AddDownloadDialog(QDialog):
             'filepath': save_path if save_path.endswith(filename) else os.path.join(save_path, filename),
             'connections': self.conn_spin.value(),
             'speed_limit': self.speed_spin.value() * 1024 if self.speed_check.isChecked() else 0,
-            'referer': self.referer_edit.text().strip(),
+            'referer': self._referer_cached,
             'extra_headers': self.extra_headers,
             'category': self.category_combo.currentText(),
             'priority': 1,
@@ -25,8 +25,20 @@ ICONS = {
     'close.svg': '''<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 24 24" fill="none" stroke="#8892b0" stroke-width="1.5" stroke-linecap="round" stroke-linejoin="round"><line x1="18" y1="6" x2="6" y2="18"></line><line x1="6" y1="6" x2="18" y2="18"></line></svg>''',
 }
 
+written = 0
 for name, content in ICONS.items():
-    with open(os.path.join(svg_dir, name), 'w', encoding='utf-8') as f:
-        f.write(content)
+    path = os.path.join(svg_dir, name)
+    # Encode once and compare/write in binary: one contiguous buffer per
+    # icon, no text-mode newline translation on either side
+    data = content.encode('utf-8')
+    try:
+        with open(path, 'rb') as f:
+            if f.read() == data:
+                continue
+    except OSError:
+        pass
+    with open(path, 'wb') as f:
+        f.write(data)
+    written += 1
 
-print(f"Generated {len(ICONS)} SVG icons in {svg_dir}")
+print(f"Generated {written}/{len(ICONS)} SVG icons in {svg_dir}")
@@ -2,21 +2,28 @@
 Main Window - IDM-style download manager UI
 """
 import os
+import re
 import sys
+from functools import lru_cache
 import time
+import datetime
 import threading
 from PyQt6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QToolBar,
-    QTableWidget, QTableWidgetItem, QHeaderView, QAbstractItemView,
+    QTableView, QHeaderView, QAbstractItemView,
     QStatusBar, QLabel, QMenu, QSystemTrayIcon, QMessageBox,
-    QApplication, QProgressBar, QSplitter, QTreeWidget, QTreeWidgetItem,
-    QFrame, QSizePolicy, QDialog, QCheckBox, QPushButton, QGraphicsDropShadowEffect
-
+    QApplication, QSplitter, QTreeWidget, QTreeWidgetItem,
+    QFrame, QSizePolicy, QDialog, QCheckBox, QPushButton,
+    QGraphicsDropShadowEffect, QStyledItemDelegate, QStyle,
+    QStyleOptionProgressBar
+)
+from PyQt6.QtCore import (
+    Qt, QTimer, pyqtSignal, QThread, QSize, QUrl, QPropertyAnimation,
+    QEasingCurve, QAbstractTableModel, QModelIndex, QSortFilterProxyModel
 )
-from PyQt6.QtCore import Qt, QTimer, pyqtSignal, QThread, QSize, QUrl, QPropertyAnimation, QEasingCurve
 from PyQt6.QtGui import (
     QIcon, QAction, QFont, QColor, QBrush, QPixmap, QPainter,
-    QClipboard, QDesktopServices
+    QPalette, QClipboard, QDesktopServices
 )
 
 from core.downloader import DownloadStatus
@@ -31,6 +38,23 @@ from ui.titlebar import CustomTitleBar
 SVG_DIR = os.path.join(os.path.dirname(__file__), "assets", "svg")
 
 
+@lru_cache(maxsize=None)
+def _icon(name: str) -> QIcon:
+    """Load an SVG icon once; repeat references share the parsed QIcon."""
+    return QIcon(os.path.join(SVG_DIR, name))
+
+
+# Clipboard URLs worth offering to download — one compiled scan instead of
+# a Python loop over every extension per clipboard change
+_DOWNLOAD_EXTS = ('mp4', 'mkv', 'avi', 'mov', 'wmv', 'flv', 'webm', 'mp3',
+                  'flac', 'zip', 'rar', '7z', 'exe', 'msi', 'pdf', 'doc',
+                  'docx', 'iso', 'apk', 'dmg', 'tar.gz', 'epub', 'm4v')
+_RE_DOWNLOAD_URL = re.compile(
+    r'^(?:https?|ftp)://[^?#]*\.(?:%s)(?:[?#]|$)'
+    % '|'.join(re.escape(e) for e in _DOWNLOAD_EXTS),
+    re.IGNORECASE)
+
+
 # Column indices
 COL_NAME     = 0
 COL_SIZE     = 1
@@ -52,22 +76,201 @@ STATUS_COLORS = {
     'Merging':     '#34d399',
 }
 
+# Theme colors for the delegate-painted progress bar (see ProgressDelegate)
+_PROGRESS_FG = QColor('#0A84FF')
+_PROGRESS_BG = QColor('#282a36')
+_PROGRESS_TEXT = QColor('#e2e2e3')
+
+
+def _status_text(task) -> str:
+    return task.status.value if hasattr(task.status, 'value') else str(task.status)
 
-class ProgressDelegate:
-    """Renders progress bar inside table cell."""
-    pass
+
+class ProgressDelegate(QStyledItemDelegate):
+    """Paints the progress column with the style engine.
+
+    One delegate serves every row; no live QProgressBar widget is kept
+    alive per task.
+    """
+
+    def paint(self, painter, option, index):
+        task = index.data(Qt.ItemDataRole.UserRole)
+        if task is None:
+            super().paint(painter, option, index)
+            return
+        if task.total_size > 0:
+            pct = int(task.downloaded / task.total_size * 100)
+            text = f"{pct}% — {format_size(task.downloaded)}"
+        elif _status_text(task) == 'Completed':
+            pct, text = 100, "100% ✓"
+        else:
+            pct, text = 0, "0%"
+        opt = QStyleOptionProgressBar()
+        opt.rect = option.rect.adjusted(4, 8, -4, -8)
+        opt.minimum = 0
+        opt.maximum = 100
+        opt.progress = pct
+        opt.text = text
+        opt.textVisible = True
+        opt.state = (QStyle.StateFlag.State_Enabled
+                     | QStyle.StateFlag.State_Horizontal)
+        # The sheet's QProgressBar rules don't reach delegate-drawn controls
+        # (option.widget is the view), so theme the bar via its palette
+        opt.palette.setColor(QPalette.ColorRole.Highlight, _PROGRESS_FG)
+        opt.palette.setColor(QPalette.ColorRole.Base, _PROGRESS_BG)
+        opt.palette.setColor(QPalette.ColorRole.Text, _PROGRESS_TEXT)
+        opt.palette.setColor(QPalette.ColorRole.HighlightedText, _PROGRESS_TEXT)
+        style = option.widget.style() if option.widget else QApplication.style()
+        style.drawControl(QStyle.ControlElement.CE_ProgressBar, opt,
+                          painter, option.widget)
+
+
+class TaskTableModel(QAbstractTableModel):
+    """Backing model for the download table.
+
+    Rows hold task references; an update is one dataChanged emission
+    across the row instead of eight per-cell QTableWidgetItem setTexts.
+    """
+
+    HEADERS = ["File Name", "Size", "Status", "Progress",
+               "Speed", "Time Left", "Category", "Date Added"]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._tasks: list = []
+        self._id_to_row: dict = {}
+        # added_at never changes and strftime is the priciest formatter on
+        # the data() path, so render each task's date exactly once
+        self._date_cache: dict = {}
+
+    # ── Qt model interface ─────────────────────────────────────────────
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._tasks)
+
+    def columnCount(self, parent=QModelIndex()):
+        return NUM_COLS
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if (orientation == Qt.Orientation.Horizontal
+                and role == Qt.ItemDataRole.DisplayRole):
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        task = self._tasks[index.row()]
+        col = index.column()
+        if role == Qt.ItemDataRole.DisplayRole:
+            if col == COL_NAME:
+                return task.filename
+            if col == COL_SIZE:
+                return format_size(task.total_size)
+            if col == COL_STATUS:
+                return _status_text(task)
+            if col == COL_SPEED:
+                if task.speed > 0 and _status_text(task) == 'Downloading':
+                    return format_speed(task.speed)
+                return "—"
+            if col == COL_ETA:
+                return format_eta(task.eta) if task.eta > 0 else "—"
+            if col == COL_CATEGORY:
+                return task.category
+            if col == COL_DATE:
+                date_str = self._date_cache.get(task.id)
+                if date_str is None:
+                    date_str = datetime.datetime.fromtimestamp(
+                        task.added_at).strftime("%m/%d %H:%M")
+                    self._date_cache[task.id] = date_str
+                return date_str
+            return None  # progress column is painted by the delegate
+        if role == Qt.ItemDataRole.ForegroundRole and col == COL_STATUS:
+            return QBrush(QColor(STATUS_COLORS.get(_status_text(task), '#c0c0e0')))
+        if role == Qt.ItemDataRole.UserRole:
+            return task
+        return None
+
+    # ── Mutation helpers ───────────────────────────────────────────────
+
+    def add_task(self, task):
+        row = len(self._tasks)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._tasks.append(task)
+        self._id_to_row[task.id] = row
+        self.endInsertRows()
+
+    def refresh_task(self, task):
+        """Add the task if unknown, else repaint its row in one emission."""
+        row = self._id_to_row.get(task.id)
+        if row is None:
+            self.add_task(task)
+            return
+        self._tasks[row] = task
+        self.dataChanged.emit(
+            self.index(row, 0), self.index(row, NUM_COLS - 1),
+            [Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.ForegroundRole])
+
+    def remove_task(self, task_id):
+        row = self._id_to_row.pop(task_id, None)
+        if row is None:
+            return
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._tasks[row]
+        self.endRemoveRows()
+        self._date_cache.pop(task_id, None)
+        for tid, r in self._id_to_row.items():
+            if r > row:
+                self._id_to_row[tid] = r - 1
+
+    def load_tasks(self, tasks):
+        """Bulk-populate in one model reset instead of a signal per row."""
+        self.beginResetModel()
+        self._tasks = list(tasks)
+        self._id_to_row = {t.id: i for i, t in enumerate(self._tasks)}
+        self.endResetModel()
+
+    def task_at(self, row):
+        return self._tasks[row] if 0 <= row < len(self._tasks) else None
+
+
+class CategoryFilterProxy(QSortFilterProxyModel):
+    """Sidebar filter evaluated against task objects in C++-driven
+    filterAcceptsRow calls instead of a Python loop hiding rows."""
+
+    _STATUS_MODES = ("Downloading", "Completed", "Paused")
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._mode = "All Downloads"
+
+    def set_mode(self, mode: str):
+        if mode != self._mode:
+            self._mode = mode
+            self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        if self._mode == "All Downloads":
+            return True
+        task = self.sourceModel().task_at(source_row)
+        if task is None:
+            return True
+        if self._mode in self._STATUS_MODES:
+            return _status_text(task) == self._mode
+        return task.category == self._mode
 
 
 class MainWindow(QMainWindow):
     task_update_signal = pyqtSignal(object)  # thread-safe task update
-    add_url_signal = pyqtSignal(str, str, str, dict) # thread-safe add url dialog from extension
+    add_url_signal = pyqtSignal(str, str, str, dict, int) # thread-safe add url dialog from extension
+    clipboard_url_signal = pyqtSignal(str)  # downloadable URL seen on the clipboard
 
     def __init__(self, queue_manager, db):
         super().__init__()
         self.queue_manager = queue_manager
         self.db = db
-        self._task_rows = {}  # task_id -> row index
         self._clipboard_last = ''
+        self._pending_toasts = []
 
         self.setWindowTitle("WITTGrp Download Manager")
         self.setWindowFlags(Qt.WindowType.FramelessWindowHint | Qt.WindowType.Window)
@@ -77,7 +280,6 @@ class MainWindow(QMainWindow):
         self._setup_ui()
         self._setup_tray()
         self._setup_signals()
-        self._start_clipboard_monitor()
         self._load_existing_tasks()
         self._center_window()
 
@@ -196,45 +398,45 @@ class MainWindow(QMainWindow):
         tb.setIconSize(QSize(20, 20))
         tb.setToolButtonStyle(Qt.ToolButtonStyle.ToolButtonTextBesideIcon)
 
-        menu_action = QAction(QIcon(os.path.join(SVG_DIR, 'menu.svg')), "Menu", self)
+        menu_action = QAction(_icon('menu.svg'), "Menu", self)
         menu_action.setToolTip("Toggle Sidebar")
         menu_action.triggered.connect(self._toggle_sidebar)
         tb.addAction(menu_action)
         
         tb.addSeparator()
 
-        add_action = QAction(QIcon(os.path.join(SVG_DIR, 'add.svg')), "Add URL", self)
+        add_action = QAction(_icon('add.svg'), "Add URL", self)
         add_action.setToolTip("Add new download (Ctrl+N)")
         add_action.triggered.connect(self._show_add_dialog)
         tb.addAction(add_action)
 
         tb.addSeparator()
 
-        start_action = QAction(QIcon(os.path.join(SVG_DIR, 'play.svg')), "Start All", self)
+        start_action = QAction(_icon('play.svg'), "Start All", self)
         start_action.triggered.connect(self.queue_manager.start_all)
         tb.addAction(start_action)
 
-        stop_action = QAction(QIcon(os.path.join(SVG_DIR, 'stop.svg')), "Stop All", self)
+        stop_action = QAction(_icon('stop.svg'), "Stop All", self)
         stop_action.triggered.connect(self.queue_manager.stop_all)
         tb.addAction(stop_action)
 
         tb.addSeparator()
 
-        scheduler_action = QAction(QIcon(os.path.join(SVG_DIR, 'menu.svg')), "Scheduler", self)
+        scheduler_action = QAction(_icon('menu.svg'), "Scheduler", self)
         scheduler_action.triggered.connect(self._show_scheduler)
         tb.addAction(scheduler_action)
 
-        grab_action = QAction(QIcon(os.path.join(SVG_DIR, 'menu.svg')), "Site Grabber", self)
+        grab_action = QAction(_icon('menu.svg'), "Site Grabber", self)
         grab_action.triggered.connect(self._show_site_grabber)
         tb.addAction(grab_action)
 
-        settings_action = QAction(QIcon(os.path.join(SVG_DIR, 'settings.svg')), "Settings", self)
+        settings_action = QAction(_icon('settings.svg'), "Settings", self)
         settings_action.triggered.connect(self._show_settings)
         tb.addAction(settings_action)
 
         tb.addSeparator()
 
-        open_folder_action = QAction(QIcon(os.path.join(SVG_DIR, 'folder.svg')), "Open Folder", self)
+        open_folder_action = QAction(_icon('folder.svg'), "Open Folder", self)
         open_folder_action.triggered.connect(self._open_downloads_folder)
         tb.addAction(open_folder_action)
 
@@ -313,12 +515,13 @@ class MainWindow(QMainWindow):
 
         return sidebar
 
-    def _build_table(self) -> QTableWidget:
-        table = QTableWidget(0, NUM_COLS)
-        table.setHorizontalHeaderLabels([
-            "File Name", "Size", "Status", "Progress",
-            "Speed", "Time Left", "Category", "Date Added"
-        ])
+    def _build_table(self) -> QTableView:
+        self.task_model = TaskTableModel(self)
+        self.task_proxy = CategoryFilterProxy(self)
+        self.task_proxy.setSourceModel(self.task_model)
+        table = QTableView()
+        table.setModel(self.task_proxy)
+        table.setItemDelegateForColumn(COL_PROGRESS, ProgressDelegate(table))
         table.setAlternatingRowColors(True)
         table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
         table.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
@@ -387,24 +590,65 @@ class MainWindow(QMainWindow):
     def _setup_signals(self):
         self.task_update_signal.connect(self._update_task_row)
         self.add_url_signal.connect(self._emit_add_dialog)
+        self.clipboard_url_signal.connect(self._on_clipboard_url)
+
+        # Event-driven clipboard monitor: fires only on actual clipboard
+        # changes, on the GUI thread, with the enabled flag cached instead
+        # of a DB read per check
+        self._clipboard_monitor_enabled = \
+            self.db.get_setting('monitor_clipboard', 'true') == 'true'
+        QApplication.clipboard().dataChanged.connect(self._on_clipboard_changed)
         # Register callback with queue manager
         self.queue_manager.on_task_update = self._on_task_update
         self.queue_manager.on_task_completed = self._on_task_completed
 
-        # Refresh timer for speed/ETA
+        # Downloader callbacks arrive at up to hundreds per second per
+        # active task; buffer dirty task ids and flush at 10 Hz so
+        # repaints scale with active tasks, not callback rate. Only ids
+        # cross the thread boundary — the task object is re-resolved on
+        # the GUI thread, so no mid-mutation attribute reads
+        self._pending_ids = set()
+        self._pending_lock = threading.Lock()
+        self._flush_timer = QTimer(self)
+        self._flush_timer.timeout.connect(self._flush_updates)
+        self._flush_timer.start(100)
+
+        # Refresh timer for speed/ETA — interval is user-tunable, and both
+        # timers pause while the window is hidden (see hideEvent/showEvent)
+        self._refresh_interval = int(self.db.get_setting('ui_refresh_ms', '500'))
         self.refresh_timer = QTimer()
         self.refresh_timer.timeout.connect(self._refresh_stats)
-        self.refresh_timer.start(1000)
+        self.refresh_timer.start(self._refresh_interval)
 
     # ── Task Loading & Display ───────────────────────────────────────────
 
     def _load_existing_tasks(self):
-        for task in self.queue_manager.get_tasks():
-            self._add_task_row(task)
+        self.task_model.load_tasks(self.queue_manager.get_tasks())
 
     def _on_task_update(self, task):
-        """Called from any thread — emits signal to update UI in main thread."""
-        self.task_update_signal.emit(task)
+        """Called from downloader threads — marks the task dirty; repeated
+        updates for one task collapse into a single flush entry."""
+        with self._pending_lock:
+            self._pending_ids.add(task.id)
+
+    def _flush_updates(self):
+        with self._pending_lock:
+            if not self._pending_ids:
+                return
+            dirty = self._pending_ids
+            self._pending_ids = set()
+        for tid in dirty:
+            task = self.queue_manager.get_task(tid)
+            if task is not None:
+                self._update_task_row(task)
+        # One queue snapshot per flush tick, shared with the stats pass
+        self._refresh_stats(self.queue_manager.get_tasks())
+
+    def _emit_add_url(self, *, url, filename='', referer='', extra_headers=None,
+                      known_size=0):
+        """Thread-safe extension-server entry point for the add dialog."""
+        self.add_url_signal.emit(url, filename, referer, extra_headers or {},
+                                 known_size)
 
     def _on_task_completed(self, task):
         """Called when a task completely finishes downloading and merging."""
@@ -420,25 +664,7 @@ class MainWindow(QMainWindow):
         QTimer.singleShot(0, _notify)
 
     def _add_task_row(self, task):
-        row = self.table.rowCount()
-        self.table.insertRow(row)
-        self.table.setRowHeight(row, 40)
-        self._task_rows[task.id] = row
-
-        for col in range(NUM_COLS):
-            item = QTableWidgetItem("")
-            item.setData(Qt.ItemDataRole.UserRole, task.id)
-            self.table.setItem(row, col, item)
-
-        # Progress bar widget
-        pb = QProgressBar()
-        pb.setRange(0, 100)
-        pb.setValue(0)
-        pb.setTextVisible(True)
-        pb.setFormat("%p%")
-        self.table.setCellWidget(row, COL_PROGRESS, pb)
-
-        self._refresh_task_row(row, task)
+        self.task_model.refresh_task(task)
 
     def _update_task_row(self, task):
         # Guard: only process DownloadTask objects (cross-thread signal delivery can
@@ -446,72 +672,45 @@ class MainWindow(QMainWindow):
         from core.queue_manager import DownloadTask
         if not isinstance(task, DownloadTask):
             return
-        if task.id not in self._task_rows:
-            self._add_task_row(task)
-        else:
-            row = self._task_rows[task.id]
-            self._refresh_task_row(row, task)
-        self._refresh_stats()
-
-    def _refresh_task_row(self, row: int, task):
-        status_str = task.status.value if hasattr(task.status, 'value') else str(task.status)
-        color = STATUS_COLORS.get(status_str, '#c0c0e0')
-
-        # Name
-        self.table.item(row, COL_NAME).setText(task.filename)
-        # Size
-        self.table.item(row, COL_SIZE).setText(format_size(task.total_size))
-        # Status
-        status_item = self.table.item(row, COL_STATUS)
-        status_item.setText(status_str)
-        status_item.setForeground(QBrush(QColor(color)))
-        # Speed
-        self.table.item(row, COL_SPEED).setText(
-            format_speed(task.speed) if task.speed > 0 and status_str == 'Downloading' else "—"
-        )
-        # ETA
-        self.table.item(row, COL_ETA).setText(
-            format_eta(task.eta) if task.eta > 0 else "—"
-        )
-        # Category
-        self.table.item(row, COL_CATEGORY).setText(task.category)
-        # Date
-        import datetime
-        self.table.item(row, COL_DATE).setText(
-            datetime.datetime.fromtimestamp(task.added_at).strftime("%m/%d %H:%M")
-        )
-        # Progress bar
-        pb = self.table.cellWidget(row, COL_PROGRESS)
-        if pb and task.total_size > 0:
-            pct = int(task.downloaded / task.total_size * 100)
-            pb.setValue(pct)
-            pb.setFormat(f"{pct}% — {format_size(task.downloaded)}")
-        elif pb and status_str == 'Completed':
-            pb.setValue(100)
-            pb.setFormat("100% ✓")
-
-    def _refresh_stats(self):
-        tasks = self.queue_manager.get_tasks()
-        active = [t for t in tasks if t.status == DownloadStatus.DOWNLOADING]
-        total_speed = sum(t.speed for t in active)
+        self.task_model.refresh_task(task)
+
+    def _refresh_stats(self, tasks=None):
+        if tasks is None:
+            tasks = self.queue_manager.get_tasks()
+        # One pass over the snapshot; enum lookups hoisted to locals
+        downloading = DownloadStatus.DOWNLOADING
+        completed_status = DownloadStatus.COMPLETED
+        total = active = completed = 0
+        total_speed = 0.0
+        for t in tasks:
+            total += 1
+            s = t.status
+            if s == downloading:
+                active += 1
+                total_speed += t.speed
+            elif s == completed_status:
+                completed += 1
         self.speed_label.setText(
-            f"  🚀 {format_speed(total_speed)}  |  ⬇ {len(active)} active  "
+            f"  🚀 {format_speed(total_speed)}  |  ⬇ {active} active  "
         )
         self.status_label.setText(
-            f"  Total: {len(tasks)} | Active: {len(active)} | "
-            f"Completed: {sum(1 for t in tasks if t.status == DownloadStatus.COMPLETED)}"
+            f"  Total: {total} | Active: {active} | Completed: {completed}"
         )
 
     # ── Context Menu ─────────────────────────────────────────────────────
 
+    def _task_at_view_row(self, row: int):
+        """Resolve a visible table row to its task through the filter proxy."""
+        source = self.task_proxy.mapToSource(self.task_proxy.index(row, 0))
+        return self.task_model.task_at(source.row())
+
     def _show_context_menu(self, position):
         row = self.table.rowAt(position.y())
-        if row < 0:
-            return
-        task_id = self.table.item(row, 0).data(Qt.ItemDataRole.UserRole)
-        task = self.queue_manager.get_task(task_id)
-        if not task:
+        task = self._task_at_view_row(row)
+        if task is None:
             return
+        task_id = task.id
+        task = self.queue_manager.get_task(task_id) or task
 
         menu = QMenu(self)
         status = task.status
@@ -545,26 +744,27 @@ class MainWindow(QMainWindow):
         menu.exec(self.table.viewport().mapToGlobal(position))
 
     def _on_double_click(self, index):
-        row = index.row()
-        task_id = self.table.item(row, 0).data(Qt.ItemDataRole.UserRole)
-        task = self.queue_manager.get_task(task_id)
+        task = self._task_at_view_row(index.row())
         if task and task.status == DownloadStatus.COMPLETED:
             self._open_file(task)
 
     # ── Actions ──────────────────────────────────────────────────────────
 
-    def _emit_add_dialog(self, url, filename, referer, extra_headers):
-        self._show_add_dialog(False, url, filename, referer, extra_headers)
-
-    def _show_add_dialog(self, _checked=False, url='', filename='', referer='', extra_headers=None):
-        dlg = AddDownloadDialog(
-            parent=self,
-            url=url, filename=filename,
-            referer=referer, extra_headers=extra_headers,
-            categories=self.db.get_categories(),
-            db=self.db,
-        )
-        dlg.download_requested.connect(self._on_download_requested)
+    def _emit_add_dialog(self, url, filename, referer, extra_headers, known_size):
+        self._show_add_dialog(False, url, filename, referer, extra_headers,
+                              known_size)
+
+    def _show_add_dialog(self, _checked=False, url='', filename='', referer='',
+                         extra_headers=None, known_size=0):
+        # One dialog instance reused across opens — widget construction and
+        # signal wiring happen once, reset() refreshes the per-open state
+        dlg = getattr(self, '_add_dialog', None)
+        if dlg is None:
+            dlg = self._add_dialog = AddDownloadDialog(parent=self, db=self.db)
+            dlg.download_requested.connect(self._on_download_requested)
+        dlg.reset(url=url, filename=filename, referer=referer,
+                  extra_headers=extra_headers, known_size=known_size,
+                  categories=self.db.get_categories())
         dlg.exec()
 
     def _show_batch_dialog(self):
@@ -575,9 +775,15 @@ class MainWindow(QMainWindow):
         )
         if ok and text.strip():
             urls = [u.strip() for u in text.strip().splitlines() if u.strip()]
-            for url in urls:
-                self.queue_manager.add_download(url=url, auto_start=True)
-            self._load_existing_tasks()
+            if not urls:
+                return
+            # Each add blocks on a synchronous probe — run the whole batch
+            # through add_downloads (parallel probes, one DB transaction) on
+            # a worker thread so a large paste can't freeze the window. Rows
+            # appear through the normal task-update flush.
+            threading.Thread(
+                target=self.queue_manager.add_downloads, args=(urls,),
+                daemon=True).start()
 
     def _on_download_requested(self, params: dict):
         task_id = self.queue_manager.add_download(
@@ -592,15 +798,43 @@ class MainWindow(QMainWindow):
             size=params.get('size', 0),
             skip_probe=params.get('skip_probe', False),
         )
+        # Coalesce toasts: a burst of adds (extension batch, rapid dialog
+        # use) produces one consolidated notification, not one per file
+        self._pending_toasts.append(params.get('filename') or 'download')
+        if len(self._pending_toasts) == 1:
+            QTimer.singleShot(500, self._flush_toasts)
+
+    def _flush_toasts(self):
+        names, self._pending_toasts = self._pending_toasts, []
+        if not names:
+            return
+        if len(names) == 1:
+            message = names[0]
+        else:
+            message = f"{len(names)} downloads added: " + ", ".join(names[:3])
+            if len(names) > 3:
+                message += "…"
         NotificationManager.get().notify(
-            title="Download Added", 
-            message=params.get('filename', 'File has been added to the queue.'),
+            title="Download Added",
+            message=message,
             action="info"
         )
 
     def _show_settings(self):
-        dlg = SettingsDialog(parent=self, db=self.db)
-        dlg.exec()
+        # One dialog instance reused across opens — tab construction is
+        # paid once, _hydrate() re-reads current values on each reopen
+        dlg = getattr(self, '_settings_dialog', None)
+        if dlg is None:
+            dlg = self._settings_dialog = SettingsDialog(parent=self, db=self.db)
+            dlg.settings_changed.connect(self._on_settings_changed)
+        else:
+            dlg._hydrate()
+        dlg.open()
+
+    def _on_settings_changed(self, settings: dict):
+        # Refresh cached flags when the dialog saves
+        self._clipboard_monitor_enabled = \
+            settings.get('monitor_clipboard', 'true') == 'true'
 
     def _show_scheduler(self):
         dlg = SchedulerDialog(parent=self, db=self.db)
@@ -640,12 +874,7 @@ class MainWindow(QMainWindow):
 
     def _remove_task(self, task_id: str, delete: bool = False):
         self.queue_manager.remove(task_id, delete_file=delete)
-        if task_id in self._task_rows:
-            row = self._task_rows.pop(task_id)
-            self.table.removeRow(row)
-            # Re-index
-            self._task_rows = {tid: (r if r < row else r - 1)
-                               for tid, r in self._task_rows.items()}
+        self.task_model.remove_task(task_id)
 
     def _remove_completed(self):
         to_remove = [t.id for t in self.queue_manager.get_tasks()
@@ -712,9 +941,9 @@ class MainWindow(QMainWindow):
 
         task_ids = []
         for row in selected_rows:
-            item = self.table.item(row, 0)
-            if item:
-                task_ids.append(item.data(Qt.ItemDataRole.UserRole))
+            task = self._task_at_view_row(row)
+            if task:
+                task_ids.append(task.id)
 
         confirmed, delete_files = self._confirm_delete(
             "Delete Selected",
@@ -763,49 +992,41 @@ class MainWindow(QMainWindow):
         QDesktopServices.openUrl(QUrl.fromLocalFile(r"D:\idm\downloads"))
 
     def _filter_by_category(self, item):
-        filter_text = item.text(0)
-        for row in range(self.table.rowCount()):
-            cat_item = self.table.item(row, COL_CATEGORY)
-            status_item = self.table.item(row, COL_STATUS)
-            if filter_text == "All Downloads":
-                self.table.setRowHidden(row, False)
-            elif filter_text in ("Downloading", "Completed", "Paused"):
-                hidden = status_item.text() != filter_text if status_item else True
-                self.table.setRowHidden(row, hidden)
-            else:
-                hidden = cat_item.text() != filter_text if cat_item else True
-                self.table.setRowHidden(row, hidden)
+        self.task_proxy.set_mode(item.text(0))
 
     # ── Clipboard Monitor ────────────────────────────────────────────────
 
-    def _start_clipboard_monitor(self):
-        def monitor():
-            while True:
-                time.sleep(1)
-                try:
-                    if self.db.get_setting('monitor_clipboard', 'true') == 'true':
-                        clipboard = QApplication.clipboard()
-                        text = clipboard.text().strip()
-                        if text != self._clipboard_last and self._is_downloadable_url(text):
-                            self._clipboard_last = text
-                            self.task_update_signal.emit(type('CB', (), {'id': '__clipboard__', 'url': text, '_cb': True})())
-                except Exception:
-                    pass
-        t = threading.Thread(target=monitor, daemon=True)
-        t.start()
+    def _on_clipboard_changed(self):
+        if not self._clipboard_monitor_enabled:
+            return
+        text = QApplication.clipboard().text().strip()
+        if text and text != self._clipboard_last and self._is_downloadable_url(text):
+            self._clipboard_last = text
+            self.clipboard_url_signal.emit(text)
+
+    def _on_clipboard_url(self, url: str):
+        self._show_add_dialog(url=url)
 
     def _is_downloadable_url(self, text: str) -> bool:
-        if not text.startswith(('http://', 'https://', 'ftp://')):
-            return False
-        lower = text.lower()
-        # Direct file extensions
-        EXT = ('.mp4', '.mkv', '.avi', '.mov', '.wmv', '.flv', '.webm', '.mp3',
-               '.flac', '.zip', '.rar', '.7z', '.exe', '.msi', '.pdf', '.doc',
-               '.docx', '.iso', '.apk', '.dmg', '.tar.gz', '.epub', '.m4v')
-        return any(lower.split('?')[0].endswith(ext) for ext in EXT)
+        return _RE_DOWNLOAD_URL.match(text) is not None
 
     # ── Tray ─────────────────────────────────────────────────────────────
 
+    def hideEvent(self, event):
+        # Minimised to tray: nobody sees the table or stats, so stop
+        # formatting them. Dirty ids keep coalescing in _pending_ids
+        # (bounded — one entry per task).
+        self.refresh_timer.stop()
+        self._flush_timer.stop()
+        super().hideEvent(event)
+
+    def showEvent(self, event):
+        self.refresh_timer.start(self._refresh_interval)
+        self._flush_timer.start(100)
+        self._flush_updates()
+        self._refresh_stats()
+        super().showEvent(event)
+
     def _tray_activated(self, reason):
         if reason == QSystemTrayIcon.ActivationReason.DoubleClick:
             self.show_normal()
@@ -2,18 +2,81 @@
 Settings Dialog - Configure all IDM preferences
 """
 import os
+import re
 from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QTabWidget, QWidget,
     QGroupBox, QFormLayout, QLabel, QLineEdit, QPushButton,
-    QSpinBox, QCheckBox, QFileDialog, QTableWidget, QTableWidgetItem,
+    QSpinBox, QCheckBox, QFileDialog, QTableView,
     QHeaderView, QAbstractItemView, QSlider
 )
-from PyQt6.QtCore import Qt, pyqtSignal
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex, QTimer, pyqtSignal
 from PyQt6.QtGui import QFont, QIcon
 from ui.titlebar import CustomTitleBar
 
 SVG_DIR = os.path.join(os.path.dirname(__file__), "assets", "svg")
 
+# Splits "MP4, .mkv,  avi" into clean extension tokens in one scan
+_EXT_RE = re.compile(r'[,\s.]+')
+
+
+class CategoryModel(QAbstractTableModel):
+    """Editable model over the in-memory category list.
+
+    Rows are plain [name, extensions_csv, save_path] lists, so the view
+    only materialises cells that are actually visible instead of one
+    QTableWidgetItem per cell.
+    """
+    HEADERS = ("Category", "Extensions (comma-separated)", "Save Folder")
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            return self._rows[index.row()][index.column()]
+        return None
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        if role != Qt.ItemDataRole.EditRole:
+            return False
+        self._rows[index.row()][index.column()] = str(value)
+        self.dataChanged.emit(index, index, [Qt.ItemDataRole.DisplayRole])
+        return True
+
+    def flags(self, index):
+        return (Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+                | Qt.ItemFlag.ItemIsEditable)
+
+    def load(self, categories: list):
+        self.beginResetModel()
+        self._rows = [[c['name'], ", ".join(c.get('extensions', [])), c.get('save_path', '')]
+                      for c in categories]
+        self.endResetModel()
+
+    def append_row(self):
+        n = len(self._rows)
+        self.beginInsertRows(QModelIndex(), n, n)
+        self._rows.append(["New Category", "", r"D:\idm\downloads\Other"])
+        self.endInsertRows()
+
+    def remove_rows(self, rows):
+        for row in sorted(set(rows), reverse=True):
+            self.beginRemoveRows(QModelIndex(), row, row)
+            del self._rows[row]
+            self.endRemoveRows()
+
 
 class SettingsDialog(QDialog):
     settings_changed = pyqtSignal(dict)  # Emits changed settings dict
@@ -25,10 +88,13 @@ class SettingsDialog(QDialog):
         self.setMinimumSize(680, 540)
         self.resize(720, 580)
         self.setModal(True)
-        self._settings = db.get_all_settings() if db else {}
-        self._categories = db.get_categories() if db else []
+        self._settings = {}
+        self._categories = []
+        self._hydrated = False
         self._build_ui()
-        self._load_values()
+        # Fetch settings after the first paint so the dialog appears
+        # immediately; built tabs are (re)populated once the data lands
+        QTimer.singleShot(0, self._hydrate)
 
     def _build_ui(self):
         from PyQt6.QtWidgets import QHBoxLayout
@@ -58,10 +124,18 @@ class SettingsDialog(QDialog):
         self.tabs = QTabWidget()
         layout.addWidget(self.tabs, 1)
 
+        # Only the General tab is built eagerly; the rest start as
+        # placeholders and are swapped in on first selection, deferring
+        # most of the dialog's widget construction
+        self._tab_builders = {1: self._connection_tab,
+                              2: self._categories_tab,
+                              3: self._integration_tab}
+        self._built_tabs = {0}
         self.tabs.addTab(self._general_tab(), "General")
-        self.tabs.addTab(self._connection_tab(), "Connection")
-        self.tabs.addTab(self._categories_tab(), "Categories")
-        self.tabs.addTab(self._integration_tab(), "Integration")
+        self.tabs.addTab(QWidget(), "Connection")
+        self.tabs.addTab(QWidget(), "Categories")
+        self.tabs.addTab(QWidget(), "Integration")
+        self.tabs.currentChanged.connect(self._ensure_tab)
 
         # Buttons
         btn_row = QHBoxLayout()
@@ -159,8 +233,9 @@ class SettingsDialog(QDialog):
         label.setStyleSheet("color: #8090b0; font-size: 12px;")
         layout.addWidget(label)
 
-        self.cat_table = QTableWidget(0, 3)
-        self.cat_table.setHorizontalHeaderLabels(["Category", "Extensions (comma-separated)", "Save Folder"])
+        self.cat_model = CategoryModel(self)
+        self.cat_table = QTableView()
+        self.cat_table.setModel(self.cat_model)
         self.cat_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
         self.cat_table.horizontalHeader().setSectionResizeMode(2, QHeaderView.ResizeMode.Stretch)
         self.cat_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
@@ -217,40 +292,53 @@ class SettingsDialog(QDialog):
         layout.addStretch()
         return w
 
-    def _load_values(self):
+    def _ensure_tab(self, idx: int):
+        """Swap a placeholder for the real tab on first selection."""
+        if idx in self._built_tabs:
+            return
+        self._built_tabs.add(idx)
+        title = self.tabs.tabText(idx)
+        real = self._tab_builders[idx]()
+        self.tabs.blockSignals(True)
+        self.tabs.removeTab(idx)
+        self.tabs.insertTab(idx, real, title)
+        self.tabs.setCurrentIndex(idx)
+        self.tabs.blockSignals(False)
+        if self._hydrated:
+            self._load_tab_values(idx)
+
+    def _hydrate(self):
+        self._settings = self.db.get_all_settings() if self.db else {}
+        self._categories = self.db.get_categories() if self.db else []
+        self._hydrated = True
+        for idx in sorted(self._built_tabs):
+            self._load_tab_values(idx)
+
+    def _load_tab_values(self, idx: int):
         s = self._settings
-        self.default_path_edit.setText(s.get('save_path', r'D:\idm\downloads'))
-        self.max_concurrent_spin.setValue(int(s.get('max_concurrent', 3)))
-        self.show_add_dialog_check.setChecked(s.get('show_add_dialog', 'true') == 'true')
-        self.auto_start_check.setChecked(s.get('auto_start_download', 'false') == 'true')
-        self.default_connections_spin.setValue(int(s.get('default_connections', 8)))
-        self.clipboard_check.setChecked(s.get('monitor_clipboard', 'true') == 'true')
-        self.tray_check.setChecked(s.get('tray_icon', 'true') == 'true')
-        self.minimize_tray_check.setChecked(s.get('minimize_to_tray', 'true') == 'true')
-        self.ext_port_spin.setValue(int(s.get('extension_server_port', 9614)))
-        self.global_speed_check.setChecked(s.get('speed_limit_enabled', 'false') == 'true')
-        self.global_speed_spin.setValue(int(s.get('global_speed_limit', 10240)))
-
-        # Load categories
-        for cat in self._categories:
-            self._add_category_row(cat)
-
-    def _add_category_row(self, cat_data: dict = None):
-        row = self.cat_table.rowCount()
-        self.cat_table.insertRow(row)
-        if cat_data:
-            self.cat_table.setItem(row, 0, QTableWidgetItem(cat_data['name']))
-            self.cat_table.setItem(row, 1, QTableWidgetItem(", ".join(cat_data.get('extensions', []))))
-            self.cat_table.setItem(row, 2, QTableWidgetItem(cat_data.get('save_path', '')))
-        else:
-            self.cat_table.setItem(row, 0, QTableWidgetItem("New Category"))
-            self.cat_table.setItem(row, 1, QTableWidgetItem(""))
-            self.cat_table.setItem(row, 2, QTableWidgetItem(r"D:\idm\downloads\Other"))
+        if idx == 0:
+            self.default_path_edit.setText(s.get('save_path', r'D:\idm\downloads'))
+            self.max_concurrent_spin.setValue(int(s.get('max_concurrent', 3)))
+            self.show_add_dialog_check.setChecked(s.get('show_add_dialog', 'true') == 'true')
+            self.auto_start_check.setChecked(s.get('auto_start_download', 'false') == 'true')
+        elif idx == 1:
+            self.default_connections_spin.setValue(int(s.get('default_connections', 8)))
+            self.global_speed_check.setChecked(s.get('speed_limit_enabled', 'false') == 'true')
+            self.global_speed_spin.setValue(int(s.get('global_speed_limit', 10240)))
+        elif idx == 2:
+            # Single model reset = one repaint regardless of row count
+            self.cat_model.load(self._categories)
+        elif idx == 3:
+            self.clipboard_check.setChecked(s.get('monitor_clipboard', 'true') == 'true')
+            self.tray_check.setChecked(s.get('tray_icon', 'true') == 'true')
+            self.minimize_tray_check.setChecked(s.get('minimize_to_tray', 'true') == 'true')
+            self.ext_port_spin.setValue(int(s.get('extension_server_port', 9614)))
+
+    def _add_category_row(self, _checked=False):
+        self.cat_model.append_row()
 
     def _remove_category_row(self):
-        rows = set(idx.row() for idx in self.cat_table.selectedIndexes())
-        for row in sorted(rows, reverse=True):
-            self.cat_table.removeRow(row)
+        self.cat_model.remove_rows(idx.row() for idx in self.cat_table.selectedIndexes())
 
     def _browse_folder(self, line_edit: QLineEdit):
         folder = QFileDialog.getExistingDirectory(self, "Select Folder", line_edit.text())
@@ -258,6 +346,9 @@ class SettingsDialog(QDialog):
             line_edit.setText(folder)
 
     def _save(self):
+        # Saving reads every tab's widgets — build any still-deferred tabs
+        for idx in range(self.tabs.count()):
+            self._ensure_tab(idx)
         s = {
             'save_path': self.default_path_edit.text(),
             'max_concurrent': str(self.max_concurrent_spin.value()),
@@ -272,18 +363,16 @@ class SettingsDialog(QDialog):
             'global_speed_limit': str(self.global_speed_spin.value()),
         }
         if self.db:
-            for k, v in s.items():
-                self.db.set_setting(k, v)
-
-            # Save categories
-            self.db.clear_categories()
-            for row in range(self.cat_table.rowCount()):
-                name = (self.cat_table.item(row, 0) or QTableWidgetItem()).text().strip()
-                exts_raw = (self.cat_table.item(row, 1) or QTableWidgetItem()).text().strip()
-                path = (self.cat_table.item(row, 2) or QTableWidgetItem()).text().strip()
+            self.db.set_settings_bulk(s)
+
+            # Save categories — one transaction for the whole table
+            cats = []
+            for name, exts_raw, path in self.cat_model._rows:
+                name, path = name.strip(), path.strip()
                 if name:
-                    exts = [e.strip().lstrip('.').lower() for e in exts_raw.split(',') if e.strip()]
-                    self.db.update_category(name, exts, path)
+                    exts = [x for x in _EXT_RE.split(exts_raw.lower()) if x]
+                    cats.append((name, exts, path))
+            self.db.replace_categories(cats)
 
         self.settings_changed.emit(s)
         self.accept()
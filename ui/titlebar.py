@@ -1,47 +1,68 @@
 import os
+from functools import lru_cache
 from PyQt6.QtWidgets import QWidget, QHBoxLayout, QLabel, QPushButton
-from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QIcon
+from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtGui import QCursor, QIcon, QPainter, QPixmap
 
 SVG_DIR = os.path.join(os.path.dirname(__file__), "assets", "svg")
 
 
+@lru_cache(maxsize=None)
+def _icon(name: str) -> QIcon:
+    """Parse each control SVG once — every titlebar shares the QIcon."""
+    return QIcon(os.path.join(SVG_DIR, name))
+
+
+@lru_cache(maxsize=None)
+def _emoji_pixmap(ch: str, size: int = 20) -> QPixmap:
+    """Rasterise an emoji once so title repaints skip colour-emoji shaping."""
+    pm = QPixmap(size, size)
+    pm.fill(Qt.GlobalColor.transparent)
+    painter = QPainter(pm)
+    painter.drawText(pm.rect(), Qt.AlignmentFlag.AlignCenter, ch)
+    painter.end()
+    return pm
+
+
 class CustomTitleBar(QWidget):
     """Custom frameless title bar with drag support and window controls."""
     def __init__(self, parent, title="🚀 WITTGrp Download Manager"):
         super().__init__(parent)
         self.parent = parent
         self.setFixedHeight(38)
-        self.setStyleSheet("background: #1e1e2e; border-bottom: 1px solid #3b4252;")
-        
+        self.setObjectName("titlebar")
+
         layout = QHBoxLayout(self)
         layout.setContentsMargins(12, 0, 0, 0)
         layout.setSpacing(0)
 
+        # Show a leading emoji as a pre-rendered pixmap so the text label
+        # stays plain ASCII and repaints never hit the emoji shaper
+        head, _, rest = title.partition(' ')
+        if rest and not head.isascii():
+            emoji_lbl = QLabel()
+            emoji_lbl.setPixmap(_emoji_pixmap(head))
+            layout.addWidget(emoji_lbl)
+            layout.addSpacing(6)
+            title = rest
         title_label = QLabel(title)
-        title_label.setStyleSheet("color: #e2e2e3; font-weight: 600; font-size: 13px; border: none;")
+        title_label.setObjectName("titlebar_title")
         layout.addWidget(title_label)
         layout.addStretch()
 
         self.btn_min = QPushButton()
-        self.btn_min.setIcon(QIcon(os.path.join(SVG_DIR, 'min.svg')))
+        self.btn_min.setIcon(_icon('min.svg'))
         self.btn_max = QPushButton()
-        self.btn_max.setIcon(QIcon(os.path.join(SVG_DIR, 'max.svg')))
+        self.btn_max.setIcon(_icon('max.svg'))
         self.btn_close = QPushButton()
-        self.btn_close.setIcon(QIcon(os.path.join(SVG_DIR, 'close.svg')))
+        self.btn_close.setIcon(_icon('close.svg'))
 
+        # Styled by object name in the global sheet — no per-widget QSS parse
         for btn in (self.btn_min, self.btn_max, self.btn_close):
             btn.setFixedSize(45, 38)
-            btn.setStyleSheet("""
-                QPushButton { background: transparent; color: #8892b0; border: none; font-size: 14px; border-radius: 0px; padding-bottom: 4px; outline: none; }
-                QPushButton:hover { background: #3b4252; color: #ffffff; }
-            """)
+            btn.setObjectName("titlebar_btn")
             layout.addWidget(btn)
-
-        self.btn_close.setStyleSheet("""
-            QPushButton { background: transparent; color: #8892b0; border: none; font-size: 14px; border-radius: 0px; padding-bottom: 4px; outline: none; }
-            QPushButton:hover { background: #e81123; color: #ffffff; }
-        """)
+        self.btn_close.setProperty("closeBtn", True)
 
         self.btn_min.clicked.connect(self.parent.showMinimized)
         self.btn_max.clicked.connect(self.toggle_max_restore)
@@ -49,6 +70,19 @@ class CustomTitleBar(QWidget):
 
         self.start_pos = None
 
+        # Manual-drag fallback: coalesce mouse moves so at most one
+        # window reposition runs per event-loop turn, not one per mouse
+        # event (500-1000 Hz on high-polling-rate mice)
+        self._pending_pos = None
+        self._move_timer = QTimer(self)
+        self._move_timer.setSingleShot(True)
+        self._move_timer.timeout.connect(self._apply_move)
+
+    def _apply_move(self):
+        if self._pending_pos is not None:
+            self.parent.move(self._pending_pos)
+            self._pending_pos = None
+
     def toggle_max_restore(self):
         # Dialogs might not have isMaximized, so handle safely
         if hasattr(self.parent, 'isMaximized') and hasattr(self.parent, 'showNormal') and hasattr(self.parent, 'showMaximized'):
@@ -59,13 +93,24 @@ class CustomTitleBar(QWidget):
 
     def mousePressEvent(self, event):
         if event.button() == Qt.MouseButton.LeftButton:
-            self.start_pos = event.globalPosition().toPoint() - self.parent.frameGeometry().topLeft()
+            # Let the compositor drive the drag where supported — no
+            # per-mouse-move Python move() calls or WM round-trips
+            win = self.parent.windowHandle()
+            if win is not None and win.startSystemMove():
+                self.start_pos = None
+                return
+            # QCursor.pos() is already an integer QPoint — no per-event
+            # QPointF round trip on the move path below
+            self.start_pos = QCursor.pos() - self.parent.frameGeometry().topLeft()
 
     def mouseMoveEvent(self, event):
         if self.start_pos is not None:
-            self.parent.move(event.globalPosition().toPoint() - self.start_pos)
+            self._pending_pos = QCursor.pos() - self.start_pos
+            if not self._move_timer.isActive():
+                self._move_timer.start(0)
 
     def mouseReleaseEvent(self, event):
+        self._apply_move()
         self.start_pos = None
 
     def mouseDoubleClickEvent(self, event):